@@ -0,0 +1,158 @@
+import numpy as np
+
+from src.ssa.core.vector_index import VectorIndex
+
+
+class IVFIndex(VectorIndex):
+    """
+    Approximate nearest-neighbour index (IVF-flat).
+
+    Rows are clustered with spherical k-means; a query scores the
+    centroids first and then only the rows of the `nprobe` closest
+    lists. Raising `nprobe` trades latency for recall; probing every
+    list gives the same result as exact search. Until the index is
+    trained it behaves like a plain VectorIndex.
+    """
+
+    def __init__(self, dim: int = None, n_lists: int = None, nprobe: int = 8, capacity: int = 64):
+        super().__init__(dim, capacity)
+        self.n_lists = n_lists
+        self.nprobe = nprobe
+        self.centroids = None
+        self._lists = np.zeros(capacity, dtype=np.int32)
+        # stable per-row keys read back by load(); doc ids alone do not survive a restart
+        self.keys = None
+
+    @property
+    def trained(self) -> bool:
+        return self.centroids is not None
+
+    @property
+    def lists(self) -> np.ndarray:
+        return self._lists[:self._size]
+
+    def _reserve(self, extra: int):
+        old_size = 0 if self._matrix is None else len(self._matrix)
+        super()._reserve(extra)
+        if len(self._matrix) != old_size or len(self._lists) < len(self._matrix):
+            lists = np.zeros(len(self._matrix), dtype=np.int32)
+            lists[:self._size] = self._lists[:self._size]
+            self._lists = lists
+
+    def _assign(self, vectors: np.ndarray, block: int = 65536) -> np.ndarray:
+        assignments = np.empty(len(vectors), dtype=np.int32)
+        for start in range(0, len(vectors), block):
+            chunk = vectors[start:start + block]
+            assignments[start:start + block] = np.argmax(chunk @ self.centroids.T, axis=1)
+        return assignments
+
+    def train(self, n_lists: int = None, iterations: int = 10, seed: int = 42):
+        """Cluster the current rows into `n_lists` inverted lists."""
+        data = self.matrix
+        if len(data) == 0:
+            return
+        n_lists = n_lists or self.n_lists or max(1, int(np.sqrt(len(data))))
+        n_lists = min(n_lists, len(data))
+
+        rng = np.random.default_rng(seed)
+        self.centroids = data[rng.choice(len(data), n_lists, replace=False)].copy()
+        for _ in range(iterations):
+            assignments = self._assign(data)
+            sums = np.zeros_like(self.centroids)
+            np.add.at(sums, assignments, data)
+            filled = np.bincount(assignments, minlength=n_lists) > 0
+            # empty lists keep their previous centroid
+            self.centroids[filled] = self.normalize(sums[filled])
+
+        self.n_lists = n_lists
+        self._lists[:self._size] = self._assign(data)
+
+    def build(self, ids, vectors, n_lists: int = None):
+        super().build(ids, vectors)
+        self.centroids = None
+        self.train(n_lists)
+
+    def add_batch(self, ids, vectors):
+        start = self._size
+        super().add_batch(ids, vectors)
+        if self.trained and self._size > start:
+            self._lists[start:self._size] = self._assign(self._matrix[start:self._size])
+
+    def remove(self, doc_ids):
+        if self._size == 0:
+            return
+        keep = ~np.isin(self.ids, np.asarray(list(doc_ids), dtype=np.int64))
+        self._lists[:int(keep.sum())] = self.lists[keep]
+        super().remove(doc_ids)
+
+    def search(self, query_vector, top_k: int = 5, threshold: float = None, mask: np.ndarray = None,
+               nprobe: int = None):
+        if not self.trained:
+            return super().search(query_vector, top_k, threshold, mask)
+        if self._size == 0 or top_k <= 0:
+            return []
+        query_vector = np.asarray(query_vector, dtype=np.float32)
+        if not query_vector.any():
+            return []
+
+        query = self.normalize(query_vector)[0]
+        nprobe = min(nprobe or self.nprobe, self.n_lists)
+        probe = np.argpartition(-(self.centroids @ query), nprobe - 1)[:nprobe]
+        probed = np.isin(self.lists, probe)
+        if mask is not None:
+            # filtered-out rows are never scored
+            probed &= mask
+        rows = np.flatnonzero(probed)
+
+        scores = self._matrix[rows] @ query
+        order = self.top_rows(scores, top_k, threshold)
+        return [(int(self._ids[rows[i]]), float(scores[i])) for i in order]
+
+    def search_many(self, query_vectors, top_k: int = 5, threshold: float = None, block: int = 1024,
+                    mask: np.ndarray = None, nprobe: int = None):
+        # each query probes its own lists, so only the untrained index can batch
+        if not self.trained:
+            return super().search_many(query_vectors, top_k, threshold, block, mask)
+        return [self.search(query, top_k, threshold, mask, nprobe) for query in np.array(query_vectors, ndmin=2)]
+
+    def save(self, path: str, keys=None):
+        """
+        Write vectors, list assignments and centroids to an .npz file.
+
+        `keys` are optional per-row (file_path, fingerprint) pairs used
+        to map rows back to documents when the index is loaded.
+        """
+        np.savez(
+            path,
+            matrix=self.matrix,
+            ids=self.ids,
+            keys=np.array(keys if keys is not None else np.zeros((0, 2)), dtype=str),
+            lists=self.lists,
+            centroids=self.centroids if self.trained else np.zeros((0, self.dim or 0), dtype=np.float32),
+            nprobe=self.nprobe
+        )
+
+    @classmethod
+    def load(cls, path: str):
+        data = np.load(path)
+        index = cls(dim=data["matrix"].shape[1], nprobe=int(data["nprobe"]))
+        VectorIndex.add_batch(index, data["ids"], data["matrix"])
+        if "keys" in data and len(data["keys"]) == len(index):
+            index.keys = [tuple(key) for key in data["keys"].tolist()]
+        if len(data["centroids"]):
+            index.centroids = data["centroids"]
+            index.n_lists = len(index.centroids)
+            index._lists[:index._size] = data["lists"]
+        return index
+
+
+def measure_recall(ann_index, exact_index, query_vectors, top_k: int = 10, nprobe: int = None) -> float:
+    """Fraction of the exact top-k ids that the ANN index also returns."""
+    hits = 0
+    total = 0
+    for query in query_vectors:
+        expected = {doc_id for doc_id, _ in exact_index.search(query, top_k)}
+        found = {doc_id for doc_id, _ in ann_index.search(query, top_k, nprobe=nprobe)}
+        hits += len(expected & found)
+        total += len(expected)
+    return hits / total if total else 1.0
@@ -0,0 +1,51 @@
+class ArtifactTracker:
+    """
+    Records which content fingerprint each derived artifact was built from.
+
+    An artifact (embedding, TF-IDF row, BM25 postings, difficulty
+    features, cluster assignment, summary) is
+    stale for a document when the document's current fingerprint differs
+    from the one recorded when the artifact was computed, or when it was
+    never computed. Nothing is stale for an artifact that has not been
+    built at all, and on-demand artifacts (summaries) are only stale for
+    documents that already have one.
+    """
+
+    ARTIFACTS = ("embedding", "tfidf", "bm25", "difficulty", "cluster", "summary")
+    ON_DEMAND = ("summary",)
+
+    def __init__(self):
+        self._built = {artifact: {} for artifact in self.ARTIFACTS}
+
+    def mark(self, artifact, documents):
+        built = self._built[artifact]
+        for doc in documents:
+            built[doc.doc_id] = doc.fingerprint
+
+    def is_stale(self, artifact, doc):
+        fingerprint = self._built[artifact].get(doc.doc_id)
+        if fingerprint is None and artifact in self.ON_DEMAND:
+            return False
+        return fingerprint != doc.fingerprint
+
+    def stale(self, artifact, documents):
+        if not self.built(artifact):
+            return []
+        return [doc for doc in documents if self.is_stale(artifact, doc)]
+
+    def built(self, artifact):
+        """Whether the artifact has been computed for any document."""
+        return bool(self._built[artifact])
+
+    def forget(self, doc_id):
+        for built in self._built.values():
+            built.pop(doc_id, None)
+
+    def clear(self, artifact=None):
+        for name in ([artifact] if artifact else self.ARTIFACTS):
+            self._built[name] = {}
+
+    def summary(self, documents):
+        """Number of stale documents per artifact."""
+        documents = list(documents)
+        return {artifact: len(self.stale(artifact, documents)) for artifact in self.ARTIFACTS}
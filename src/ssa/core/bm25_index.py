@@ -0,0 +1,158 @@
+import numpy as np
+
+from src.ssa.core.document import tokenize
+from src.ssa.core.vector_index import VectorIndex
+
+
+class BM25Index:
+    """
+    In-memory inverted index with BM25 scoring.
+
+    Postings map a vocabulary term id to the rows containing it and the
+    term frequency in each. Every add() gets a fresh row; remove() marks
+    the row dead and updates document frequencies, and dead rows are
+    compacted away once they make up half of the index. Row ids, lengths
+    and the live-row mask are kept in preallocated arrays, so a query
+    does no per-row Python work.
+    """
+
+    def __init__(self, vocabulary, k1: float = 1.5, b: float = 0.75, capacity: int = 64):
+        self.vocabulary = vocabulary
+        self.k1 = k1
+        self.b = b
+        self._postings = {}
+        self._arrays = {}
+        self._df = {}
+        self._row_terms = []
+        self._size = 0
+        self._ids = np.full(capacity, -1, dtype=np.int64)
+        self._lengths = np.zeros(capacity, dtype=np.float32)
+        self._alive = np.zeros(capacity, dtype=bool)
+        self._rows = {}
+        self._total_length = 0
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __contains__(self, doc_id):
+        return doc_id in self._rows
+
+    @property
+    def ids(self) -> np.ndarray:
+        """doc_id of every row, -1 for removed rows."""
+        return self._ids[:self._size]
+
+    def _reserve(self):
+        if self._size < len(self._ids):
+            return
+        capacity = 2 * len(self._ids)
+
+        def grow(array, fill):
+            grown = np.full(capacity, fill, dtype=array.dtype)
+            grown[:self._size] = array[:self._size]
+            return grown
+
+        self._ids = grow(self._ids, -1)
+        self._lengths = grow(self._lengths, 0)
+        self._alive = grow(self._alive, False)
+
+    def add(self, doc_id, token_ids):
+        if doc_id in self._rows:
+            self.remove([doc_id])
+        self._reserve()
+        row = self._size
+        terms, counts = np.unique(token_ids, return_counts=True)
+        for term, count in zip(terms.tolist(), counts.tolist()):
+            rows, tfs = self._postings.setdefault(term, ([], []))
+            rows.append(row)
+            tfs.append(count)
+            self._df[term] = self._df.get(term, 0) + 1
+            self._arrays.pop(term, None)
+        self._ids[row] = doc_id
+        self._lengths[row] = len(token_ids)
+        self._alive[row] = True
+        self._row_terms.append(terms.astype(np.int32))
+        self._size += 1
+        self._rows[doc_id] = row
+        self._total_length += len(token_ids)
+
+    def add_documents(self, documents):
+        for doc in documents:
+            self.add(doc.doc_id, doc.token_ids)
+
+    def remove(self, doc_ids):
+        for doc_id in doc_ids:
+            row = self._rows.pop(doc_id, None)
+            if row is None:
+                continue
+            for term in self._row_terms[row].tolist():
+                self._df[term] -= 1
+            self._ids[row] = -1
+            self._alive[row] = False
+            self._total_length -= int(self._lengths[row])
+        if self._size > 64 and len(self._rows) < self._size // 2:
+            self._compact()
+
+    def _compact(self):
+        live = [(doc_id, row) for doc_id, row in self._rows.items()]
+        postings = {}
+        new_rows = {}
+        for new_row, (doc_id, _) in enumerate(sorted(live, key=lambda item: item[1])):
+            new_rows[doc_id] = new_row
+        remap = {old: new_rows[doc_id] for doc_id, old in live}
+        for term, (rows, tfs) in self._postings.items():
+            kept = [(remap[row], tf) for row, tf in zip(rows, tfs) if row in remap]
+            if kept:
+                postings[term] = ([row for row, _ in kept], [tf for _, tf in kept])
+        order = np.array(sorted(remap, key=remap.get), dtype=np.int64)
+        kept = len(order)
+        self._ids[:kept] = self._ids[order]
+        self._ids[kept:self._size] = -1
+        self._lengths[:kept] = self._lengths[order]
+        self._alive[:kept] = True
+        self._alive[kept:self._size] = False
+        self._size = kept
+        self._row_terms = [self._row_terms[row] for row in order.tolist()]
+        self._postings = postings
+        self._df = {term: len(rows) for term, (rows, _) in postings.items()}
+        self._arrays = {}
+        self._rows = new_rows
+
+    def _posting_arrays(self, term):
+        arrays = self._arrays.get(term)
+        if arrays is None:
+            rows, tfs = self._postings[term]
+            arrays = (np.asarray(rows, dtype=np.int64), np.asarray(tfs, dtype=np.float32))
+            self._arrays[term] = arrays
+        return arrays
+
+    def query_terms(self, query: str):
+        terms = [self.vocabulary.lookup(token) for token in tokenize(query)]
+        return [term for term in terms if term is not None and self._df.get(term)]
+
+    def scores(self, query: str) -> np.ndarray:
+        """BM25 score of every row for `query` (0 for rows without a query term)."""
+        n_docs = len(self._rows)
+        scores = np.zeros(self._size, dtype=np.float32)
+        if n_docs == 0:
+            return scores
+        lengths = self._lengths
+        avg_length = self._total_length / n_docs or 1.0
+        for term in self.query_terms(query):
+            rows, tfs = self._posting_arrays(term)
+            df = self._df[term]
+            idf = np.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            norm = self.k1 * (1 - self.b + self.b * lengths[rows] / avg_length)
+            scores[rows] += idf * tfs * (self.k1 + 1) / (tfs + norm)
+        return scores
+
+    def search(self, query: str, top_k: int = 5, mask: np.ndarray = None):
+        """Top-k (doc_id, score) pairs with a positive BM25 score, among rows where `mask` is True."""
+        scores = self.scores(query)
+        if len(scores) == 0:
+            return []
+        alive = self._alive[:self._size]
+        if mask is not None:
+            alive = alive & mask
+        rows = VectorIndex.top_rows(scores, top_k, threshold=1e-9, mask=alive)
+        return [(int(self._ids[row]), float(scores[row])) for row in rows]
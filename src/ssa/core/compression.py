@@ -0,0 +1,31 @@
+import base64
+import lzma
+import zlib
+
+CODECS = ("zlib", "lzma")
+
+
+def compress(text, codec):
+    data = (text or "").encode("utf-8")
+    if codec == "zlib":
+        return zlib.compress(data, 6)
+    if codec == "lzma":
+        return lzma.compress(data, preset=6)
+    raise ValueError(f"Unknown compression codec: {codec}")
+
+
+def decompress(blob, codec):
+    if codec == "zlib":
+        return zlib.decompress(blob).decode("utf-8")
+    if codec == "lzma":
+        return lzma.decompress(blob).decode("utf-8")
+    raise ValueError(f"Unknown compression codec: {codec}")
+
+
+def to_text(blob):
+    """Compressed bytes as ASCII, for JSON records."""
+    return base64.b64encode(blob).decode("ascii")
+
+
+def from_text(text):
+    return base64.b64decode(text)
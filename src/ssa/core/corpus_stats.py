@@ -0,0 +1,138 @@
+import heapq
+
+import numpy as np
+
+
+class CorpusStatistics:
+    """
+    Incrementally maintained corpus statistics.
+
+    Keeps the document count, total word count and a term-frequency
+    table over vocabulary ids, updated as documents are added and
+    removed. Top terms come from a lazy max-heap: every count change
+    pushes a fresh (-count, id) entry and stale entries are dropped when
+    they reach the top, so top_terms(k) does not scan the corpus.
+
+    The fingerprint and token ids each document was counted with are
+    remembered, so an edited document can be re-counted (update) or
+    removed without subtracting tokens it was never counted with.
+    """
+
+    def __init__(self, vocabulary):
+        self.vocabulary = vocabulary
+        self.document_count = 0
+        self.total_words = 0
+        self.term_counts = np.zeros(1024, dtype=np.int64)
+        self._heap = []
+        self._nonzero = 0
+        # doc_id -> (fingerprint, token ids it was counted with, or None if unknown)
+        self._counted = {}
+
+    @classmethod
+    def from_term_counts(cls, vocabulary, document_count, total_words, term_counts, documents=()):
+        """
+        Seed statistics from already-merged counts (e.g. a map-reduce pass)
+        over `documents`. Their token ids are not known here, so an edit
+        to one of them can only be detected, not re-counted.
+        """
+        stats = cls(vocabulary)
+        stats._counted = {doc.doc_id: (doc.fingerprint, None) for doc in documents}
+        stats.document_count = document_count
+        stats.total_words = total_words
+        if term_counts:
+            terms = vocabulary.encode(list(term_counts))
+            stats._grow(int(terms.max()))
+            stats.term_counts[terms] = list(term_counts.values())
+            stats._nonzero = len(terms)
+            stats._rebuild_heap()
+        return stats
+
+    def _grow(self, max_id):
+        if max_id >= len(self.term_counts):
+            counts = np.zeros(max(2 * len(self.term_counts), max_id + 1), dtype=np.int64)
+            counts[:len(self.term_counts)] = self.term_counts
+            self.term_counts = counts
+
+    def _update(self, ids, sign):
+        if len(ids) == 0:
+            return
+        terms, counts = np.unique(ids, return_counts=True)
+        self._grow(int(terms[-1]))
+        before = self.term_counts[terms]
+        after = before + sign * counts
+        self.term_counts[terms] = after
+        self._nonzero += int(np.count_nonzero(after)) - int(np.count_nonzero(before))
+        for term, count in zip(terms.tolist(), after.tolist()):
+            if count > 0:
+                heapq.heappush(self._heap, (-count, term))
+        if len(self._heap) > 4 * self._nonzero + 1024:
+            self._rebuild_heap()
+
+    def _rebuild_heap(self):
+        terms = np.flatnonzero(self.term_counts)
+        self._heap = list(zip((-self.term_counts[terms]).tolist(), terms.tolist()))
+        heapq.heapify(self._heap)
+
+    def add(self, doc):
+        ids = doc.token_ids
+        self.document_count += 1
+        self.total_words += len(ids)
+        self._update(ids, 1)
+        self._counted[doc.doc_id] = (doc.fingerprint, ids)
+
+    def _subtract(self, ids):
+        self.document_count -= 1
+        self.total_words -= len(ids)
+        self._update(ids, -1)
+
+    def remove(self, doc):
+        """
+        Undo add(doc) using the tokens it was counted with. Returns False
+        if those are unknown and the content has changed since (the
+        statistics can then no longer be corrected and must be rebuilt).
+        """
+        fingerprint, ids = self._counted.pop(doc.doc_id, (None, None))
+        if ids is None:
+            if fingerprint is not None and fingerprint != doc.fingerprint:
+                return False
+            ids = doc.token_ids
+        self._subtract(ids)
+        return True
+
+    def update(self, doc):
+        """Re-count `doc` if its content changed; False if it cannot be re-counted (see remove)."""
+        counted = self._counted.get(doc.doc_id)
+        if counted is not None and counted[0] == doc.fingerprint:
+            return True
+        if counted is not None:
+            if not self.remove(doc):
+                return False
+        self.add(doc)
+        return True
+
+    @property
+    def average_word_count(self):
+        return self.total_words / self.document_count if self.document_count else 0.0
+
+    def term_frequency(self, token):
+        term = self.vocabulary.lookup(token)
+        if term is None or term >= len(self.term_counts):
+            return 0
+        return int(self.term_counts[term])
+
+    def top_terms(self, k=5):
+        """The k most frequent (token, count) pairs."""
+        heap = self._heap
+        counts = self.term_counts
+        top = []
+        seen = set()
+        while heap and len(top) < k:
+            neg_count, term = heapq.heappop(heap)
+            # stale (count has changed since the push) or a duplicate entry
+            if counts[term] != -neg_count or term in seen:
+                continue
+            seen.add(term)
+            top.append((neg_count, term))
+        for entry in top:
+            heapq.heappush(heap, entry)
+        return [(self.vocabulary.decode([term])[0], -neg_count) for neg_count, term in top]
@@ -1,40 +1,147 @@
+import hashlib
 import re
+import sys
 import numpy as np
 from datetime import datetime
+from src.ssa.core.vocabulary import default_vocabulary
+from src.ssa.core import compression
+
+def _intern(value):
+    # document_type / ingestion_date repeat across the corpus; share one str
+    return sys.intern(value) if isinstance(value, str) else value
+
+def content_hash(text):
+    """sha256 of a text; the one key for fingerprints, the embedding cache and ingest dedup."""
+    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+
+def tokenize(text):
+    text_lower = (text or "").lower()
+    text = re.sub(r'[^\w\s]', '', text_lower)
+    return text.split()
+
+def token_stats(tokens):
+    """
+    (word_count, avg_word_length, unique_ratio, long_word_ratio) of a token list.
+
+    Same features as Document.token_stats, without encoding the tokens:
+    ad-hoc text (predictions, worker processes) never grows the shared
+    vocabulary.
+    """
+    word_count = len(tokens)
+    if word_count == 0:
+        return 0, 0, 0, 0
+    lengths = np.fromiter((len(w) for w in tokens), dtype=np.int32, count=word_count)
+    return (
+        word_count,
+        float(lengths.mean()),
+        len(set(tokens)) / word_count,
+        int(np.count_nonzero(lengths > 6)) / word_count
+    )
 
 class Document:
+    __slots__ = (
+        "doc_id", "title", "_content", "file_path", "ingestion_date", "document_type",
+        "_tokens", "_token_ids", "_fingerprint", "numeric_token", "difficulty_score", "difficulty_label", "cluster_id"
+    )
+
+    # token ids index into one vocabulary shared by the whole corpus
+    vocabulary = default_vocabulary
+
     def __init__(self, title, content, file_path, ingestion_date, document_type):
+        self.doc_id = None
         self.title = title
+        self._tokens = None
+        self._token_ids = None
+        self._fingerprint = None
         self.content = content
         self.file_path = file_path
-        self.ingestion_date = ingestion_date
-        self.tokens = []
-        self.document_type = document_type
+        self.ingestion_date = _intern(ingestion_date)
+        self.document_type = _intern(document_type)
+        self.numeric_token = None
         self.difficulty_score = 0
         self.difficulty_label = None
         self.cluster_id = None
+    # _content is the text, or a (blob, codec) tuple when kept compressed;
+    # one slot, so readers never see a blob paired with the wrong codec
+    @property
+    def content(self):
+        # compressed content is decompressed on every access, never cached
+        content = self._content
+        if isinstance(content, tuple):
+            return compression.decompress(*content)
+        return content
+    @content.setter
+    def content(self, value):
+        self._content = value
+        self._token_ids = None
+        self._fingerprint = None
+    @property
+    def codec(self):
+        """Codec of the in-memory content, or None if it is plain text."""
+        content = self._content
+        return content[1] if isinstance(content, tuple) else None
+    @property
+    def is_compressed(self):
+        return self.codec is not None
+    def set_compressed_content(self, blob, codec):
+        """Use already-compressed content (e.g. read from storage) as-is."""
+        self.content = (blob, codec)
+    def compress_content(self, codec):
+        """Keep the content compressed in memory; no-op if already compressed with `codec`."""
+        if self._content is None or self.codec == codec:
+            return
+        # the text is unchanged, so tokens and fingerprint stay valid
+        self._content = (compression.compress(self.content, codec), codec)
+    @property
+    def fingerprint(self):
+        """sha256 of the content; derived artifacts are stale when it changes."""
+        if self._fingerprint is None:
+            self._fingerprint = content_hash(self.content)
+        return self._fingerprint
+    @property
+    def token_ids(self) -> np.ndarray:
+        """int32 vocabulary ids of the tokens, computed once and cached."""
+        if self._token_ids is None:
+            tokens = self._tokens if self._tokens is not None else self._tokenize()
+            self._token_ids = self.vocabulary.encode(tokens)
+        return self._token_ids
+    @property
+    def tokens(self):
+        """Tokens of the content, decoded from token_ids unless explicitly set."""
+        if self._tokens is not None:
+            return self._tokens
+        return self.vocabulary.decode(self.token_ids)
+    @tokens.setter
+    def tokens(self, value):
+        self._tokens = value
+        self._token_ids = None
+    def _tokenize(self):
+        return tokenize(self.content)
     def preprocess_text(self):
-        text_lower = self.content.lower()
-        text = re.sub(r'[^\w\s]', '', text_lower)
-        self.tokens = text.split()
         return self.tokens
     def tokens_to_numeric(self):
-        if not self.tokens:
-            self.preprocess_text()
-        self.numeric_token = np.array([len(word) for word in self.tokens])
+        self.numeric_token = self.vocabulary.token_lengths[self.token_ids]
         return self.numeric_token
+    def token_stats(self):
+        """(word_count, avg_word_length, unique_ratio, long_word_ratio) from token_ids."""
+        ids = self.token_ids
+        word_count = len(ids)
+        if word_count == 0:
+            return 0, 0, 0, 0
+        lengths = self.vocabulary.token_lengths[ids]
+        return (
+            word_count,
+            float(lengths.mean()),
+            len(np.unique(ids)) / word_count,
+            int(np.count_nonzero(lengths > 6)) / word_count
+        )
+    def extract_difficulty_features(self):
+        return list(self.token_stats())
     def calculate_difficulty(self):
-        if not self.tokens:
-            self.preprocess_text()
-
-        word_count = len(self.tokens)
+        word_count, ave_word_length, unique_ratio, long_word_ratio = self.token_stats()
         if word_count == 0:
             self.difficulty_label = "easy"
             return self.difficulty_label
-        
-        ave_word_length = sum(len(w) for w in self.tokens)/word_count
-        unique_ratio = len(set(self.tokens))/word_count
-        long_word_ratio = len([w for w in self.tokens if len(w) > 6])/word_count
 
         self.difficulty_score = (
             ave_word_length * 0.4 + 
@@ -54,24 +161,40 @@ class Document:
         return f"Document title: {self.title}, document filePath: {self.file_path}, date of ingestion: {self.ingestion_date}"
     def __repr__(self):
         return f"{self.title} {self.file_path} {self.ingestion_date}"
-    def to_dict(self):
-        """Convert document to dictionary for JSON serialization."""
-        return {
+    def to_dict(self, codec=None):
+        """
+        Convert document to dictionary for JSON serialization.
+
+        With a codec, content is written as base64 "content_z" plus "codec".
+        """
+        data = {
             "title": self.title,
-            "content": self.content,
             "file_path": self.file_path,
             "ingestion_date": self.ingestion_date,
             "document_type": self.document_type
         }
+        content = self._content
+        if codec is None:
+            data["content"] = self.content
+        elif isinstance(content, tuple) and content[1] == codec:
+            data["content_z"] = compression.to_text(content[0])
+            data["codec"] = codec
+        else:
+            data["content_z"] = compression.to_text(compression.compress(self.content, codec))
+            data["codec"] = codec
+        return data
 
     @classmethod
     def from_dict(cls, data):
         """Create document from dictionary."""
-        return cls(
+        doc = cls(
             title=data.get("title", ""),
             content=data.get("content", ""),
             file_path=data.get("file_path", ""),
             ingestion_date=data.get("ingestion_date"),
             document_type=data.get("document_type")
         )
+        if "content_z" in data:
+            doc.set_compressed_content(compression.from_text(data["content_z"]), data["codec"])
+        return doc
     
\ No newline at end of file
@@ -0,0 +1,148 @@
+import json
+import os
+import re
+
+import numpy as np
+
+from src.ssa.core.document import content_hash
+
+
+class EmbeddingCache:
+    """
+    On-disk embedding store keyed by (model_name, sha256 of content).
+
+    Vectors live in a raw float32 `.bin` file that is memory-mapped on
+    open. A `.keys` sidecar holds the content hash of every row, one
+    fixed-width line per row, and a small JSON header records the model
+    and dimension. New vectors and their keys are appended in step, so
+    unchanged documents are never re-embedded and a put costs only its
+    own rows. Rows past the end of either file (a crash mid-append) are
+    dropped on open and overwritten by the next put.
+    """
+
+    KEY_BYTES = 65  # sha256 hex digest + newline
+
+    def __init__(self, cache_dir: str = "embedding_cache", model_name: str = "all-MiniLM-L6-v2"):
+        self.cache_dir = cache_dir
+        self.model_name = model_name
+        safe_name = re.sub(r"[^\w.-]", "_", model_name)
+        self.index_file = os.path.join(cache_dir, f"{safe_name}.index.json")
+        self.vector_file = os.path.join(cache_dir, f"{safe_name}.bin")
+        self.key_file = os.path.join(cache_dir, f"{safe_name}.keys")
+
+        self.dim = None
+        self.rows = {}
+        self.n_rows = 0
+        self._vectors = None
+        self._load()
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __contains__(self, text):
+        return self.content_hash(text) in self.rows
+
+    content_hash = staticmethod(content_hash)
+
+    def _load(self):
+        if not all(os.path.exists(path) for path in (self.index_file, self.vector_file, self.key_file)):
+            return
+        try:
+            with open(self.index_file, "r") as f:
+                index = json.load(f)
+        except (json.JSONDecodeError, OSError):
+            print(f"Embedding cache index '{self.index_file}' is corrupted. Ignoring it.")
+            return
+        if index.get("model_name") != self.model_name or not index.get("dim"):
+            return
+
+        self.dim = int(index["dim"])
+        # only rows complete in both files count (a crash may leave a
+        # partial vector or vectors without keys at the end)
+        n_rows = min(
+            os.path.getsize(self.vector_file) // self._row_bytes,
+            os.path.getsize(self.key_file) // self.KEY_BYTES
+        )
+        with open(self.key_file, "rb") as f:
+            keys = f.read(n_rows * self.KEY_BYTES).decode("ascii").split("\n")[:n_rows]
+        self.rows = {key: row for row, key in enumerate(keys)}
+        self.n_rows = n_rows
+        self._map_vectors()
+
+    @property
+    def _row_bytes(self):
+        return self.dim * np.dtype(np.float32).itemsize
+
+    def _map_vectors(self):
+        if self.n_rows == 0:
+            self._vectors = None
+            return
+        self._vectors = np.memmap(self.vector_file, dtype=np.float32, mode="r", shape=(self.n_rows, self.dim))
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """The memory-mapped (rows, dim) matrix of every cached vector."""
+        if self._vectors is None:
+            return np.zeros((0, self.dim or 0), dtype=np.float32)
+        return self._vectors
+
+    def get(self, text: str):
+        row = self.rows.get(self.content_hash(text))
+        if row is None:
+            return None
+        return np.asarray(self._vectors[row])
+
+    def get_many(self, texts):
+        """Return a list aligned with `texts`; misses are None."""
+        return [self.get(text) for text in texts]
+
+    def put_many(self, texts, vectors):
+        new_rows = []
+        for text, vector in zip(texts, vectors):
+            key = self.content_hash(text)
+            vector = np.asarray(vector, dtype=np.float32)
+            # zero vectors come from failed model loads; don't persist them
+            if key in self.rows or not vector.any():
+                continue
+            if self.dim is None:
+                self.dim = vector.shape[0]
+            if vector.shape[0] != self.dim:
+                raise ValueError(f"Expected vectors of size {self.dim}, got {vector.shape[0]}")
+            new_rows.append((key, vector))
+
+        if not new_rows:
+            return 0
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        start = self.n_rows
+        if start == 0:
+            # new (or unreadable) cache: start the files over
+            self._write_index()
+        # write at the end of the known rows, overwriting any partial tail;
+        # vectors go first so a crash never leaves a key without its row
+        self._append(self.vector_file, start * self._row_bytes,
+                     b"".join(vector.tobytes() for _, vector in new_rows))
+        self._append(self.key_file, start * self.KEY_BYTES,
+                     "".join(key + "\n" for key, _ in new_rows).encode("ascii"))
+        for offset, (key, _) in enumerate(new_rows):
+            self.rows[key] = start + offset
+        self.n_rows = start + len(new_rows)
+
+        self._map_vectors()
+        return len(new_rows)
+
+    @staticmethod
+    def _append(path, offset, data):
+        with open(path, "r+b" if os.path.exists(path) else "wb") as f:
+            f.truncate(offset)
+            f.seek(offset)
+            f.write(data)
+
+    def put(self, text: str, vector):
+        return self.put_many([text], [vector])
+
+    def _write_index(self):
+        tmp_file = self.index_file + ".tmp"
+        with open(tmp_file, "w") as f:
+            json.dump({"model_name": self.model_name, "dim": self.dim}, f)
+        os.replace(tmp_file, self.index_file)
@@ -0,0 +1,197 @@
+"""
+Bulk directory ingestion.
+
+IngestPipeline runs four stages connected by bounded queues, so only a
+few batches are ever in flight:
+
+    walk -> read (thread pool) -> dedup + batch -> embed + index
+
+Readers extract text in parallel, duplicates are dropped by content
+hash, and each batch is embedded with one encode_batch call and
+appended to the manager and its vector index. Storage is written once
+at the end, followed by a single TF-IDF refit.
+"""
+
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+
+from src.ssa.core.document import Document, content_hash
+
+try:
+    from pypdf import PdfReader
+    PDF_AVAILABLE = True
+except ImportError:
+    PDF_AVAILABLE = False
+
+TEXT_EXTENSIONS = (".txt", ".md", ".rst", ".csv", ".json", ".html", ".py")
+
+# marks the end of a stage's output
+_DONE = object()
+
+
+def extract_text(path):
+    """Text of a supported file, or None if the type is not supported."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".pdf":
+        if not PDF_AVAILABLE:
+            return None
+        reader = PdfReader(path)
+        return "\n".join(page.extract_text() or "" for page in reader.pages)
+    if extension in TEXT_EXTENSIONS:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            return f.read()
+    return None
+
+
+class IngestPipeline:
+    def __init__(self, manager, read_workers=None, batch_size=64, queue_size=256,
+                 embed=True, update_tfidf=True, progress_every=500):
+        self.manager = manager
+        self.read_workers = read_workers or min(32, (os.cpu_count() or 1) * 2)
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        self.embed = embed
+        self.update_tfidf = update_tfidf
+        self.progress_every = progress_every
+        self.stats = {}
+        self._lock = threading.Lock()
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def _error(self, path, error):
+        with self._lock:
+            self.stats["errors"].append((path, str(error)))
+
+    # every stage sends _DONE from a finally block: a stage that dies
+    # without it leaves the next one (and run()) waiting forever
+
+    def _walk(self, root, paths):
+        try:
+            for directory, _, files in os.walk(root):
+                for name in sorted(files):
+                    paths.put(os.path.join(directory, name))
+        except Exception as e:
+            self._error(root, e)
+        finally:
+            for _ in range(self.read_workers):
+                paths.put(_DONE)
+
+    def _read(self, paths, texts):
+        try:
+            while True:
+                path = paths.get()
+                if path is _DONE:
+                    return
+                try:
+                    text = extract_text(path)
+                except Exception as e:
+                    # e.g. pypdf's PdfReadError, which is not an OSError / ValueError
+                    self._error(path, e)
+                    continue
+                if text is None:
+                    self._count("skipped")
+                elif text.strip():
+                    texts.put((path, text, content_hash(text)))
+        finally:
+            texts.put(_DONE)
+
+    def _batch(self, texts, batches, seen):
+        batch = []
+        finished_readers = 0
+        try:
+            while finished_readers < self.read_workers:
+                item = texts.get()
+                if item is _DONE:
+                    finished_readers += 1
+                    continue
+                path, text, digest = item
+                try:
+                    if digest in seen or self.manager.has_document(path):
+                        self._count("duplicates")
+                        continue
+                    seen.add(digest)
+                    title = os.path.splitext(os.path.basename(path))[0]
+                    batch.append(Document(
+                        title=title,
+                        content=text,
+                        file_path=path,
+                        ingestion_date=datetime.now().strftime("%Y-%m-%d"),
+                        document_type=None
+                    ))
+                except Exception as e:
+                    # keep draining `texts` so the readers never block
+                    self._error(path, e)
+                    continue
+                if len(batch) >= self.batch_size:
+                    batches.put(batch)
+                    batch = []
+            if batch:
+                batches.put(batch)
+        finally:
+            batches.put(_DONE)
+
+    def _existing_hashes(self):
+        return {doc.fingerprint for doc in list(self.manager.documents)}
+
+    def run(self, root):
+        """Ingest every supported file under `root`; returns the run statistics."""
+        manager = self.manager
+        self.stats = {"ingested": 0, "duplicates": 0, "skipped": 0, "errors": []}
+        embedder = getattr(manager, "embedder", None) if self.embed else None
+
+        paths = queue.Queue(self.queue_size)
+        texts = queue.Queue(self.queue_size)
+        batches = queue.Queue(max(2, self.queue_size // self.batch_size))
+        threads = [threading.Thread(target=self._walk, args=(root, paths), daemon=True)]
+        threads += [
+            threading.Thread(target=self._read, args=(paths, texts), daemon=True)
+            for _ in range(self.read_workers)
+        ]
+        threads.append(threading.Thread(
+            target=self._batch, args=(texts, batches, self._existing_hashes()), daemon=True
+        ))
+
+        start = time.time()
+        for thread in threads:
+            thread.start()
+
+        ingested = []
+        last_report = 0
+        while True:
+            batch = batches.get()
+            if batch is _DONE:
+                break
+            vectors = None
+            if embedder is not None:
+                contents = [doc.content for doc in batch]
+                if hasattr(embedder, "encode_batch"):
+                    vectors = embedder.encode_batch(contents)
+                else:
+                    vectors = [embedder.document_to_vector(text) for text in contents]
+            manager.add_documents(batch, vectors)
+            ingested.extend(batch)
+            if len(ingested) - last_report >= self.progress_every:
+                last_report = len(ingested)
+                elapsed = time.time() - start
+                print(f"Ingested {len(ingested)} document(s) ({len(ingested) / elapsed:.1f} docs/sec)")
+        for thread in threads:
+            thread.join()
+
+        if ingested:
+            manager.persist_documents(ingested)
+            if self.update_tfidf and len(manager.documents) > 1:
+                manager.vectorize_documents()
+
+        elapsed = time.time() - start
+        self.stats["ingested"] = len(ingested)
+        self.stats["seconds"] = elapsed
+        self.stats["docs_per_sec"] = len(ingested) / elapsed if elapsed > 0 else 0.0
+        print(f"Ingested {len(ingested)} document(s) from {root} in {elapsed:.2f}s "
+              f"({self.stats['docs_per_sec']:.1f} docs/sec, {self.stats['duplicates']} duplicate(s), "
+              f"{self.stats['skipped']} unsupported, {len(self.stats['errors'])} error(s))")
+        return self.stats
@@ -0,0 +1,132 @@
+import json
+import os
+
+from src.ssa.core.document import Document
+from src.ssa.core import compression
+
+
+def iter_json_array(path, start=0, limit=None, chunk_size=1 << 16):
+    """
+    Incrementally parse a top-level JSON array, yielding one element at a time.
+
+    Only one element (plus a read buffer) is held in memory, instead of the
+    whole decoded file. Raises json.JSONDecodeError on malformed input,
+    like json.load. An element that does not fit the buffer is retried
+    only after the pending text has doubled, so large elements still
+    parse in linear time.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8") as f:
+        buffer = ""
+        pos = 0
+        eof = False
+
+        def read_more(target=0):
+            """Grow the unconsumed text to at least `target` chars (at least one chunk)."""
+            nonlocal buffer, pos, eof
+            # drop what has been consumed; join once instead of per chunk
+            chunks = [buffer[pos:]]
+            size = len(chunks[0])
+            target = max(target, size + 1)
+            while size < target:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    eof = True
+                    break
+                chunks.append(chunk)
+                size += len(chunk)
+            buffer = "".join(chunks)
+            pos = 0
+            return len(chunks) > 1
+
+        def skip(chars):
+            nonlocal pos
+            while True:
+                while pos < len(buffer) and buffer[pos] in chars:
+                    pos += 1
+                if pos < len(buffer) or not read_more():
+                    return
+
+        skip(" \t\r\n")
+        if pos >= len(buffer) or buffer[pos] != "[":
+            raise json.JSONDecodeError("Expecting '['", buffer, pos)
+        pos += 1
+
+        index = 0
+        end_index = None if limit is None else start + limit
+        while end_index is None or index < end_index:
+            skip(" \t\r\n,")
+            if pos >= len(buffer):
+                raise json.JSONDecodeError("Unterminated array", buffer, pos)
+            if buffer[pos] == "]":
+                return
+            while True:
+                try:
+                    value, end = decoder.raw_decode(buffer, pos)
+                    # a value that ends exactly at the buffer edge may be truncated
+                    if end < len(buffer) or eof:
+                        break
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                read_more(2 * (len(buffer) - pos))
+            pos = end
+            if index >= start:
+                yield value
+            index += 1
+
+
+def entry_to_document(entry):
+    # Handle both "Content" and "content" for backward compatibility
+    content = entry.get("content") or entry.get("Content", "")
+    doc = Document(
+        title=entry.get("title", ""),
+        content=content,
+        file_path=entry.get("file_path", ""),
+        ingestion_date=entry.get("ingestion_date", ""),
+        document_type=entry.get("document_type")
+    )
+    if "content_z" in entry:
+        # stays compressed in memory until content is read
+        doc.set_compressed_content(compression.from_text(entry["content_z"]), entry["codec"])
+    return doc
+
+
+def iter_documents(path, start=0, limit=None):
+    """Yield `Document`s from a documents.json file one at a time."""
+    for entry in iter_json_array(path, start, limit):
+        yield entry_to_document(entry)
+
+
+def write_json_array(path, items, indent=4):
+    """
+    Atomically write `items` as a JSON array.
+
+    Items are streamed into `path + ".tmp"`, which is fsynced and then
+    renamed over `path`, so the file is always either the old or the new
+    complete array; readers of the old file are never blocked.
+    """
+    tmp_path = path + ".tmp"
+    pad = " " * indent if indent else ""
+    separator = ",\n" if indent else ","
+    count = 0
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write("[\n" if indent else "[")
+        for item in items:
+            if count:
+                f.write(separator)
+            text = json.dumps(item, indent=indent)
+            f.write(pad + text.replace("\n", "\n" + pad) if indent else text)
+            count += 1
+        f.write("\n]" if indent else "]")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    if hasattr(os, "O_DIRECTORY"):
+        # make the rename itself durable
+        dir_fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+    return count
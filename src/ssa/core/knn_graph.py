@@ -0,0 +1,160 @@
+import numpy as np
+
+from src.ssa.core.vector_index import VectorIndex
+
+
+class KNNGraph:
+    """
+    Precomputed k-nearest-neighbour graph over the rows of a vector index.
+
+    Each document keeps its `k` most similar other documents (ids and
+    cosine scores, best first), so a related-documents lookup is O(k).
+    Scores come from index.scores_many() a block of rows at a time; the
+    block is sized so one (block x rows) score matrix stays under
+    `max_block_bytes`. Inserting documents scores only the new rows
+    against the index and merges them into existing lists; removing one
+    recomputes just the lists that pointed at it.
+    """
+
+    def __init__(self, k: int = 10, max_block_bytes: int = 64 * 1024 * 1024):
+        self.k = k
+        self.max_block_bytes = max_block_bytes
+        self._rows = {}
+        self._ids = np.zeros(0, dtype=np.int64)
+        self.neighbor_ids = np.zeros((0, k), dtype=np.int64)
+        self.neighbor_scores = np.zeros((0, k), dtype=np.float32)
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __contains__(self, doc_id):
+        return doc_id in self._rows
+
+    def _block(self, n_rows: int) -> int:
+        return max(1, self.max_block_bytes // (4 * max(n_rows, 1)))
+
+    def _top_k(self, index, vectors, query_ids):
+        """Best k neighbours of each vector among the index rows, excluding the query itself."""
+        scores = index.scores_many(vectors)
+        scores[index.ids[None, :] == np.asarray(query_ids)[:, None]] = -np.inf
+        rows = VectorIndex.top_rows_many(scores, self.k)
+        top_scores = np.take_along_axis(scores, rows, axis=1)
+        ids = np.where(top_scores > -np.inf, index.ids[rows], -1)
+        return self._pad(ids, top_scores), scores
+
+    def _pad(self, ids, scores):
+        if ids.shape[1] < self.k:
+            width = self.k - ids.shape[1]
+            ids = np.pad(ids, ((0, 0), (0, width)), constant_values=-1)
+            scores = np.pad(scores, ((0, 0), (0, width)), constant_values=-np.inf)
+        return ids, scores.astype(np.float32)
+
+    def build(self, index):
+        """Compute the neighbour lists of every row of `index`."""
+        ids = index.ids.copy()
+        n = len(ids)
+        self._ids = ids
+        self._rows = {doc_id: row for row, doc_id in enumerate(ids.tolist())}
+        self.neighbor_ids = np.full((n, self.k), -1, dtype=np.int64)
+        self.neighbor_scores = np.full((n, self.k), -np.inf, dtype=np.float32)
+        block = self._block(n)
+        matrix = index.float_matrix()
+        for start in range(0, n, block):
+            end = min(start + block, n)
+            (top_ids, top_scores), _ = self._top_k(index, matrix[start:end], ids[start:end])
+            self.neighbor_ids[start:end] = top_ids
+            self.neighbor_scores[start:end] = top_scores
+
+    def _columns(self, index, doc_ids):
+        """Row of each doc id in `index` (all ids must be present)."""
+        order = np.argsort(index.ids, kind="stable")
+        return order[np.searchsorted(index.ids, doc_ids, sorter=order)]
+
+    def add(self, index, ids, vectors):
+        """
+        Insert documents already added to `index`.
+
+        New rows get their lists from one scan; an existing list changes
+        only where a new document beats its current k-th neighbour.
+        Re-added ids (re-embedded documents) replace their old rows.
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        if len(ids) == 0:
+            return
+        # lists that pointed at a re-added id are recomputed against the
+        # updated index, so they must not be merged into again below
+        repaired = self.remove(index, ids)
+        vectors = VectorIndex.normalize(vectors)
+        old = len(self._ids)
+        merge_rows = np.flatnonzero(~np.isin(self._ids, repaired))
+        columns = self._columns(index, self._ids[merge_rows])
+        new_ids = []
+        new_scores = []
+        block = self._block(len(index))
+        for start in range(0, len(ids), block):
+            batch = ids[start:start + block]
+            (top_ids, top_scores), scores = self._top_k(index, vectors[start:start + block], batch)
+            new_ids.append(top_ids)
+            new_scores.append(top_scores)
+            if len(merge_rows):
+                self._merge(merge_rows, batch, scores[:, columns].T)
+
+        self._ids = np.concatenate([self._ids, ids])
+        for row, doc_id in enumerate(ids.tolist(), start=old):
+            self._rows[doc_id] = row
+        self.neighbor_ids = np.vstack([self.neighbor_ids] + new_ids)
+        self.neighbor_scores = np.vstack([self.neighbor_scores] + new_scores)
+
+    def _merge(self, rows, candidate_ids, candidate_scores):
+        # candidate_scores: (len(rows), len(candidate_ids))
+        improved = candidate_scores.max(axis=1) > self.neighbor_scores[rows, -1]
+        rows = rows[improved]
+        if len(rows) == 0:
+            return
+        scores = np.hstack([self.neighbor_scores[rows], candidate_scores[improved]])
+        ids = np.hstack([
+            self.neighbor_ids[rows],
+            np.broadcast_to(candidate_ids, (len(rows), len(candidate_ids)))
+        ])
+        best = VectorIndex.top_rows_many(scores, self.k)
+        self.neighbor_scores[rows] = np.take_along_axis(scores, best, axis=1)
+        self.neighbor_ids[rows] = np.take_along_axis(ids, best, axis=1)
+
+    def remove(self, index, doc_ids):
+        """
+        Drop documents (already removed from `index`) from the graph.
+
+        Lists that contained a removed document are recomputed against
+        `index` so they stay exact; returns the ids of those documents.
+        """
+        removed = np.asarray([doc_id for doc_id in doc_ids if doc_id in self._rows], dtype=np.int64)
+        if len(removed) == 0:
+            return np.zeros(0, dtype=np.int64)
+        keep = ~np.isin(self._ids, removed)
+        self._ids = self._ids[keep]
+        self.neighbor_ids = self.neighbor_ids[keep]
+        self.neighbor_scores = self.neighbor_scores[keep]
+        self._rows = {doc_id: row for row, doc_id in enumerate(self._ids.tolist())}
+
+        stale = np.flatnonzero(np.isin(self.neighbor_ids, removed).any(axis=1))
+        if len(index) == 0:
+            self.neighbor_ids[stale] = -1
+            self.neighbor_scores[stale] = -np.inf
+            return self._ids[stale]
+        block = self._block(len(index))
+        for start in range(0, len(stale), block):
+            rows = stale[start:start + block]
+            columns = self._columns(index, self._ids[rows])
+            (top_ids, top_scores), _ = self._top_k(index, index.vectors(columns), self._ids[rows])
+            self.neighbor_ids[rows] = top_ids
+            self.neighbor_scores[rows] = top_scores
+        return self._ids[stale]
+
+    def neighbors(self, doc_id, top_n: int = None):
+        """Up to `top_n` (doc_id, similarity) pairs for `doc_id`, best first."""
+        row = self._rows.get(doc_id)
+        if row is None:
+            return []
+        ids = self.neighbor_ids[row, :top_n]
+        scores = self.neighbor_scores[row, :top_n]
+        return [(doc_id, score) for doc_id, score in zip(ids.tolist(), scores.tolist()) if doc_id >= 0]
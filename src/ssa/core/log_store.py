@@ -0,0 +1,185 @@
+import json
+import os
+import re
+
+from src.ssa.core.json_stream import entry_to_document
+
+
+class DocumentLogStore:
+    """
+    Append-only, log-structured document store.
+
+    Records are JSON lines in numbered segment files inside `directory`:
+    {"op": "put", "doc": {...}} or {"op": "delete", "key": ...}, keyed by
+    the document's file_path. Adding a document is a single appended
+    line. Opening the store replays the segments to rebuild the key ->
+    offset index and truncates a torn final line left by a crash.
+    compact() rewrites only the live records into a new segment via
+    temp file + atomic rename, then drops the old segments.
+    """
+
+    SEGMENT_PATTERN = re.compile(r"^segment-(\d{6})\.jsonl$")
+
+    def __init__(self, directory, segment_max_bytes=64 * 1024 * 1024,
+                 compact_ratio=0.5, min_compact_records=1000, fsync=False):
+        self.directory = directory
+        self.segment_max_bytes = segment_max_bytes
+        self.compact_ratio = compact_ratio
+        self.min_compact_records = min_compact_records
+        self.fsync = fsync
+
+        self.index = {}
+        self.dead_records = 0
+        self._active = None
+        self._active_id = 0
+        os.makedirs(directory, exist_ok=True)
+        self._recover()
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, key):
+        return key in self.index
+
+    def _segment_path(self, segment_id):
+        return os.path.join(self.directory, f"segment-{segment_id:06d}.jsonl")
+
+    def _segment_ids(self):
+        ids = []
+        for name in os.listdir(self.directory):
+            match = self.SEGMENT_PATTERN.match(name)
+            if match:
+                ids.append(int(match.group(1)))
+        return sorted(ids)
+
+    def _recover(self):
+        """Replay every segment in order to rebuild the in-memory index."""
+        for name in os.listdir(self.directory):
+            if name.endswith(".tmp"):
+                os.remove(os.path.join(self.directory, name))
+
+        segment_ids = self._segment_ids()
+        for segment_id in segment_ids:
+            path = self._segment_path(segment_id)
+            good_offset = 0
+            with open(path, "rb") as f:
+                for line in f:
+                    # a record without its newline is a torn final write
+                    if not line.endswith(b"\n"):
+                        break
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        print(f"Skipping corrupted record at {path}:{good_offset}")
+                    else:
+                        self._apply(record, segment_id, good_offset, len(line))
+                    good_offset += len(line)
+            if good_offset < os.path.getsize(path):
+                print(f"Recovered {path}: dropped {os.path.getsize(path) - good_offset} byte(s) of a torn write.")
+                os.truncate(path, good_offset)
+
+        self._active_id = segment_ids[-1] if segment_ids else 1
+        self._open_active()
+
+    def _apply(self, record, segment_id, offset, length):
+        if record.get("op") == "put":
+            key = record["doc"].get("file_path")
+            if key in self.index:
+                self.dead_records += 1
+            self.index[key] = (segment_id, offset, length)
+        elif record.get("op") == "delete":
+            if self.index.pop(record.get("key"), None) is not None:
+                self.dead_records += 1
+            self.dead_records += 1
+
+    def _open_active(self):
+        if self._active is not None:
+            self._active.close()
+        self._active = open(self._segment_path(self._active_id), "ab")
+
+    def _append(self, record):
+        line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+        if self._active.tell() > 0 and self._active.tell() + len(line) > self.segment_max_bytes:
+            self._active_id += 1
+            self._open_active()
+        offset = self._active.tell()
+        self._active.write(line)
+        self._active.flush()
+        if self.fsync:
+            os.fsync(self._active.fileno())
+        self._apply(record, self._active_id, offset, len(line))
+
+    def put(self, doc_dict):
+        """Append one document; O(1) I/O."""
+        self._append({"op": "put", "doc": doc_dict})
+        self.maybe_compact()
+
+    def put_many(self, doc_dicts):
+        for doc_dict in doc_dicts:
+            self._append({"op": "put", "doc": doc_dict})
+        self.maybe_compact()
+
+    def delete(self, key):
+        if key not in self.index:
+            return False
+        self._append({"op": "delete", "key": key})
+        self.maybe_compact()
+        return True
+
+    def _read(self, location):
+        segment_id, offset, length = location
+        with open(self._segment_path(segment_id), "rb") as f:
+            f.seek(offset)
+            return json.loads(f.read(length))["doc"]
+
+    def get(self, key):
+        location = self.index.get(key)
+        return None if location is None else self._read(location)
+
+    def iter_documents(self):
+        """Yield live document dicts in segment order, one segment open at a time."""
+        by_segment = {}
+        for location in self.index.values():
+            by_segment.setdefault(location[0], []).append(location)
+        for segment_id in sorted(by_segment):
+            with open(self._segment_path(segment_id), "rb") as f:
+                for _, offset, length in sorted(by_segment[segment_id], key=lambda loc: loc[1]):
+                    f.seek(offset)
+                    yield json.loads(f.read(length))["doc"]
+
+    def documents(self):
+        """Yield live records as Document objects."""
+        for doc in self.iter_documents():
+            yield entry_to_document(doc)
+
+    def maybe_compact(self):
+        total = len(self.index) + self.dead_records
+        if total >= self.min_compact_records and self.dead_records > self.compact_ratio * total:
+            self.compact()
+
+    def compact(self):
+        """Rewrite the live records into one fresh segment and drop the rest."""
+        old_ids = self._segment_ids()
+        new_id = (old_ids[-1] if old_ids else 0) + 1
+        final_path = self._segment_path(new_id)
+        tmp_path = final_path + ".tmp"
+
+        with open(tmp_path, "wb") as f:
+            for doc in self.iter_documents():
+                f.write((json.dumps({"op": "put", "doc": doc}, ensure_ascii=False) + "\n").encode("utf-8"))
+            f.flush()
+            os.fsync(f.fileno())
+        self._active.close()
+        os.replace(tmp_path, final_path)
+        for segment_id in old_ids:
+            os.remove(self._segment_path(segment_id))
+
+        self.index = {}
+        self.dead_records = 0
+        self._active = None
+        self._recover()
+
+    def close(self):
+        if self._active is not None:
+            self._active.close()
+            self._active = None
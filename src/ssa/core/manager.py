@@ -1,9 +1,27 @@
-from src.ssa.core.document import Document
+from src.ssa.core.document import Document, token_stats, tokenize
 from src.ssa.core.embedder import DocumentEmbedder
+from src.ssa.core.vector_index import VectorIndex
+from src.ssa.core.ann_index import IVFIndex
+from src.ssa.core.knn_graph import KNNGraph
+from src.ssa.core.quantized_index import QuantizedVectorIndex, IndexVectorView
+from src.ssa.core.embedding_cache import EmbeddingCache
+from src.ssa.core.json_stream import iter_json_array, iter_documents, write_json_array, entry_to_document
+from src.ssa.core.wal import WriteAheadLog
+from src.ssa.core.log_store import DocumentLogStore
+from src.ssa.core.sqlite_store import SQLiteDocumentStore
+from src.ssa.core.corpus_stats import CorpusStatistics
+from src.ssa.core.bm25_index import BM25Index
+from src.ssa.core.metadata_index import MetadataIndex
+from src.ssa.core.query_cache import QueryCache, normalize_query
+from src.ssa.core.parallel_analytics import map_reduce_analytics
+from src.ssa.core.snapshot import write_snapshot, CorpusSnapshot
+from src.ssa.core.ingest import IngestPipeline
+from src.ssa.core.artifacts import ArtifactTracker
+from src.ssa.core.compression import CODECS as COMPRESSION_CODECS
 from src.ssa.ml.tfidf_engine import TfidfEngine
 from typing import List, Dict, Optional, Any
 from src.ssa.ml.semantic_summarizer import SemanticSummarizer  
-from src.ssa.ml.features import extract_difficulty_features
+from src.ssa.ml.features import difficulty_feature_matrix, difficulty_scores
 from src.ssa.ml.difficulty_classifier import Difficulty_classifier
 from src.ssa.ml.transformer_embedder import TransformerEmbedder
 from src.ssa.ml.simple_llm import SimpleLLM
@@ -12,8 +30,8 @@ from ..ml.flan_t5_client import FlanT5Client
 from ..ml.prompt_engineer import PromptEngineer
 import numpy as np
 import pandas as pd
-from collections import Counter
 from datetime import datetime
+from itertools import islice
 try:
     import gensim.downloader as api
     from sklearn.metrics.pairwise import cosine_similarity
@@ -25,83 +43,405 @@ from sklearn.decomposition import PCA
 import matplotlib.pyplot as plt
 import os
 import json
+import threading
 class DocumentManager:
-    def __init__(self, storage_file="documents.json"):
+    def __init__(self, storage_file="documents.json", vector_precision="float32", initial_load_limit=None,
+                 storage_backend="json", compression=None):
         self.storage_file = storage_file
+        if compression is not None and compression not in COMPRESSION_CODECS:
+            raise ValueError(f"Unknown compression codec: {compression}")
+        # content is persisted (and kept in memory) compressed with this codec
+        self.compression = compression
+        self.vector_precision = vector_precision
+        self.storage_backend = storage_backend
+        if storage_backend == "log":
+            # storage_file is a directory of append-only JSONL segments
+            self.store = DocumentLogStore(storage_file)
+        elif storage_backend == "sqlite":
+            # documents are loaded as LazyDocuments; content stays on disk
+            self.store = SQLiteDocumentStore(storage_file)
+        elif storage_backend == "json":
+            self.store = None
+            # mutations since the last full save; replayed on load
+            self.wal = WriteAheadLog(storage_file + ".wal")
+        else:
+            raise ValueError(f"Unknown storage backend: {storage_backend}")
+        if self.store is not None:
+            self.wal = None
+        self.wal_checkpoint_records = 1000
+        self._index_lock = threading.RLock()
+        self._save_lock = threading.Lock()
+        self._next_doc_id = 0
+        self._corpus_stats = None
+        self._keyword_index = None
+        self._metadata_index = None
+        # bumped on every change that can alter a search result; part of every query cache key
+        self.corpus_version = 0
+        self.query_cache = QueryCache()
         self.documents = []
         self.tfidf_matrix = None
         self.tfidf_vectorizer = None
         self.kmeans = None
+        # nearest-neighbour lists over the embeddings; see build_knn_graph()
+        self.knn_graph = None
         self.tfidf_engine = TfidfEngine()
-        self._load_initial_documents()
+        # content hash -> difficulty feature row
+        self._difficulty_features = {}
+        # which content fingerprint each embedding / TF-IDF row / ... was built from
+        self.artifacts = ArtifactTracker()
+        self._summaries = {}
+        self._load_initial_documents(initial_load_limit)
+    @property
+    def documents(self):
+        return self._documents
+
+    @documents.setter
+    def documents(self, documents):
+        with self._index_lock:
+            self._documents = documents
+            self._reindex_documents()
+
+    def _reindex_documents(self):
+        """Rebuild the id / title / file_path indexes from self.documents."""
+        with self._index_lock:
+            self._by_id = {}
+            self._by_title = {}
+            self._by_path = {}
+            # rebuilt lazily by corpus_stats / keyword_index / metadata_index
+            self._corpus_stats = None
+            self._keyword_index = None
+            self._metadata_index = None
+            for doc in self._documents:
+                self._index_document(doc)
+            self._bump_corpus_version()
+
+    def _index_document(self, doc):
+        if getattr(doc, "doc_id", None) is None or doc.doc_id in self._by_id:
+            doc.doc_id = self._next_doc_id
+        self._next_doc_id = max(self._next_doc_id, doc.doc_id + 1)
+        self._by_id[doc.doc_id] = doc
+        self._by_title.setdefault(doc.title, []).append(doc.doc_id)
+        self._by_path.setdefault(doc.file_path, doc)
+
+    def _ensure_indexed(self):
+        # callers may append to or replace self.documents directly
+        if len(self._by_id) != len(self._documents):
+            self._reindex_documents()
+
+    def _append_document(self, doc):
+        with self._index_lock:
+            self._documents.append(doc)
+            self._index_document(doc)
+            if self._corpus_stats is not None:
+                self._corpus_stats.add(doc)
+            if self._keyword_index is not None:
+                self._keyword_index.add(doc.doc_id, doc.token_ids)
+                self.artifacts.mark("bm25", [doc])
+            if self._metadata_index is not None:
+                self._metadata_index.add(doc)
+            self._bump_corpus_version()
+
+    def _bump_corpus_version(self):
+        """Invalidate cached query results after a corpus, embedding or label change."""
+        with self._index_lock:
+            self.corpus_version += 1
+        if self.query_cache is not None:
+            self.query_cache.clear()
+
+    def _cached_query(self, kind, query, params, compute):
+        """Serve `compute()` from the query cache, keyed by the corpus version it ran against."""
+        if self.query_cache is None:
+            return compute()
+        key = (kind, normalize_query(query), params, self.corpus_version)
+        result = self.query_cache.get(key)
+        if result is None:
+            result = compute()
+            self.query_cache.put(key, result)
+        return result
+
+    @staticmethod
+    def _filter_key(filters):
+        # hashable, order-independent form of a filters dict
+        return tuple(sorted(
+            (field, frozenset(value) if isinstance(value, (list, tuple, set, frozenset)) else value)
+            for field, value in (filters or {}).items()
+            if value is not None
+        ))
+
+    def _nprobe_key(self, mode):
+        # ANN results depend on nprobe, which callers may change between queries
+        if mode == "ann" and getattr(self, "ann_index", None) is not None:
+            return self.ann_index.nprobe
+        return None
+
+    def query_cache_stats(self):
+        """Hit rate, entry count and approximate memory use of the query result cache."""
+        if self.query_cache is None:
+            return {}
+        return dict(self.query_cache.stats(), corpus_version=self.corpus_version)
+
+    @property
+    def corpus_stats(self):
+        """CorpusStatistics for self.documents; built on first use, then kept up to date."""
+        self._ensure_indexed()
+        with self._index_lock:
+            if self._corpus_stats is None:
+                stats = CorpusStatistics(Document.vocabulary)
+                for doc in self._documents:
+                    stats.add(doc)
+                self._corpus_stats = stats
+            return self._corpus_stats
+
+    @property
+    def keyword_index(self):
+        """BM25 inverted index over self.documents; built on first use, then kept up to date."""
+        self._ensure_indexed()
+        with self._index_lock:
+            if self._keyword_index is None:
+                index = BM25Index(Document.vocabulary)
+                index.add_documents(self._documents)
+                self.artifacts.clear("bm25")
+                self.artifacts.mark("bm25", self._documents)
+                self._keyword_index = index
+            return self._keyword_index
+
+    @property
+    def metadata_index(self):
+        """Filter bitmaps over document metadata; built on first use, then kept up to date."""
+        self._ensure_indexed()
+        with self._index_lock:
+            if self._metadata_index is None:
+                index = MetadataIndex(max(64, self._next_doc_id))
+                index.add_documents(self._documents)
+                self._metadata_index = index
+            return self._metadata_index
+
+    def update_metadata(self, documents=None):
+        """
+        Re-read the filterable metadata of `documents` (default: all).
+
+        Labels assigned by manager methods are picked up automatically;
+        call this after setting difficulty_label / cluster_id elsewhere.
+        """
+        with self._index_lock:
+            if self._metadata_index is not None:
+                self._metadata_index.add_documents(self.documents if documents is None else documents)
+        self._bump_corpus_version()
+
+    def _filter_rows(self, filters, ids):
+        """Boolean mask over the rows of an index with `ids`, or None without filters."""
+        if not filters:
+            return None
+        index = self.metadata_index
+        with self._index_lock:
+            return index.rows(index.mask(filters), ids)
+
+    def facet_counts(self, filters=None):
+        """Per-field value counts ({field: {value: count}}) of the documents matching `filters`."""
+        index = self.metadata_index
+        with self._index_lock:
+            return index.facets(index.mask(filters))
+
+    def get_document(self, doc_id):
+        self._ensure_indexed()
+        return self._by_id.get(doc_id)
+
+    def get_document_by_title(self, title):
+        self._ensure_indexed()
+        ids = self._by_title.get(title)
+        return self._by_id[ids[0]] if ids else None
+
+    def get_document_by_path(self, file_path):
+        self._ensure_indexed()
+        return self._by_path.get(file_path)
+
+    def has_document(self, file_path):
+        return self.get_document_by_path(file_path) is not None
+
+    def remove_document(self, doc_id, persist=True):
+        """Remove a document from memory, the vector indexes and (optionally) storage."""
+        self._ensure_indexed()
+        with self._index_lock:
+            doc = self._by_id.pop(doc_id, None)
+            if doc is None:
+                return False
+            self._documents.remove(doc)
+            if self._corpus_stats is not None and not self._corpus_stats.remove(doc):
+                self._corpus_stats = None
+            if self._keyword_index is not None:
+                self._keyword_index.remove([doc_id])
+            if self._metadata_index is not None:
+                self._metadata_index.remove([doc_id])
+            self._bump_corpus_version()
+            self._by_title[doc.title].remove(doc_id)
+            if not self._by_title[doc.title]:
+                del self._by_title[doc.title]
+            if self._by_path.get(doc.file_path) is doc:
+                del self._by_path[doc.file_path]
+                for other in self._documents:
+                    if other.file_path == doc.file_path:
+                        self._by_path[doc.file_path] = other
+                        break
+
+        self.artifacts.forget(doc_id)
+        self._summaries.pop(doc_id, None)
+        self._difficulty_features.pop(doc.fingerprint, None)
+        for index_name in ("vector_index", "ann_index"):
+            index = getattr(self, index_name, None)
+            if index is not None:
+                index.remove([doc_id])
+        if self.knn_graph is not None:
+            self.knn_graph.remove(self.vector_index, [doc_id])
+        self._sync_vector_rows()
+
+        if persist:
+            if self.store is not None:
+                self.store.delete(doc.file_path)
+            else:
+                self._log_mutations([{"op": "delete", "key": doc.file_path}])
+        return True
+
     def predict_document_type(self, content):
         if not hasattr(self, "doc_type_pipeline"):
             print("X Model not traind yet.")
             return None
         return self.doc_type_pipeline.predict([content])[0]
     def predict_difficulty(self, content):
-        temp_doc = Document (
-            title = "temp",
-            content = content,
-            file_path="",
-            ingestion_date="",
-            document_type=None
-        )
-        features = [temp_doc.extract_difficulty_features()]
+        # not a corpus Document: its tokens must not be added to the shared vocabulary
+        features = [list(token_stats(tokenize(content)))]
         prediction = self.diff_classifier.predict(features)
 
         return prediction[0]
     def vectorize_documents(self):
-        self.tfidf_engine.vectorize(self.documents)
+        documents = list(self.documents)
+        self.tfidf_engine.vectorize(documents)
+        self.artifacts.clear("tfidf")
+        self.artifacts.mark("tfidf", documents)
 
     def cluster_documents(self, n_clusters=3):
-        self.tfidf_engine.cluster(self.documents, n_clusters)
+        documents = list(self.documents)
+        if self.tfidf_engine.cluster(documents, n_clusters) is not None:
+            self.artifacts.clear("cluster")
+            self.artifacts.mark("cluster", documents)
+        self.update_metadata()
 
     def show_clusters(self):
         self.tfidf_engine.show_clusters(self.documents)
 
-    def analyze_difficulty(self):
+    def difficulty_features(self, n_jobs=1):
+        """(N, 4) difficulty feature matrix for self.documents, cached per content hash."""
+        return difficulty_feature_matrix(self.documents, cache=self._difficulty_features, n_jobs=n_jobs)
+
+    def compute_difficulty(self, n_jobs=1):
+        """Score and label every document in one vectorized pass."""
+        documents = list(self.documents)
+        features = difficulty_feature_matrix(documents, cache=self._difficulty_features, n_jobs=n_jobs)
+        scores, labels = difficulty_scores(features)
+        for doc, score, label in zip(documents, scores.tolist(), labels):
+            doc.difficulty_score = score
+            doc.difficulty_label = label
+        self.artifacts.mark("difficulty", documents)
+        self.update_metadata(documents)
+        return features
+
+    def analyze_difficulty(self, n_jobs=1, parallel=False, workers=None):
+        if parallel:
+            documents = list(self.documents)
+            scores, labels = difficulty_scores(self.map_reduce(workers)["features"])
+            for doc, score, label in zip(documents, scores.tolist(), labels):
+                doc.difficulty_score = score
+                doc.difficulty_label = label
+            self.artifacts.mark("difficulty", documents)
+            self.update_metadata(documents)
+        else:
+            self.compute_difficulty(n_jobs)
         for doc in self.documents:
-            label = doc.calculate_difficulty()
-            print(f"{doc.title}: {label} (score={doc.difficulty_score:.2f})")
-    def to_dataframe(self):
+            print(f"{doc.title}: {doc.difficulty_label} (score={doc.difficulty_score:.2f})")
+
+    def map_reduce(self, workers=None, shard_size=None):
+        """Run the map-reduce analytics pass over a snapshot of self.documents."""
+        return map_reduce_analytics(list(self.documents), workers=workers, shard_size=shard_size)
+
+    def to_dataframe(self, parallel=False, workers=None):
         if not self.documents:
             print('No documents avilabel')
             return None
+        documents = list(self.documents)
+        if parallel:
+            word_counts = self.map_reduce(workers)["features"][:, 0].astype(int)
+        else:
+            word_counts = [len(doc.token_ids) for doc in documents]
         data = []
     
-        for doc in self.documents:
-            tokens = doc.preprocess_text()
-
+        for doc, word_count in zip(documents, word_counts):
             data.append({
              "title": doc.title,
              "file_path": doc.file_path,
              "ingestion_date": doc.ingestion_date,
-             "word_count": len(tokens),
+             "word_count": word_count,
              "content": doc.content
             })
 
         df = pd.DataFrame(data)
         return df
-    def analytics_dashboard(self):
-        df = self.to_dataframe()
-        if df is None:
+    def _snapshot_dir(self):
+        return os.path.join(os.path.dirname(self.storage_file) or ".", "snapshot")
+
+    def export_snapshot(self, directory=None, include_content=True):
+        """Write a columnar, memory-mappable snapshot of the corpus (see core/snapshot.py)."""
+        self._ensure_indexed()
+        documents = list(self.documents)
+        features = difficulty_feature_matrix(documents, cache=self._difficulty_features)
+        directory = write_snapshot(
+            directory or self._snapshot_dir(), documents, features,
+            vector_index=getattr(self, "vector_index", None),
+            include_content=include_content
+        )
+        print(f"Wrote snapshot of {len(documents)} document(s) to {directory}")
+        return directory
+
+    def load_snapshot(self, directory=None, mmap=True):
+        return CorpusSnapshot(directory or self._snapshot_dir(), mmap=mmap)
+
+    def analytics_dashboard(self, parallel=False, workers=None):
+        if not self.documents:
+            print('No documents avilabel')
             return
-        print(f'total documents:{len(df)}')
-        print(f"average word count:{df['word_count'].mean():.2f}")
-        all_words = []
-        for document in self.documents:
-            if not document.tokens:
-                document.preprocess_text()
-            all_words.extend(document.tokens)
-        common_words = Counter(all_words).most_common(5)
-        for word, count in common_words:
+        if parallel and self._corpus_stats is None:
+            # seed the incremental statistics from one parallel pass
+            documents = list(self.documents)
+            result = map_reduce_analytics(documents, workers=workers)
+            with self._index_lock:
+                self._corpus_stats = CorpusStatistics.from_term_counts(
+                    Document.vocabulary, len(documents),
+                    int(result["features"][:, 0].sum()), result["term_counts"], documents
+                )
+        stats = self.corpus_stats
+        print(f'total documents:{stats.document_count}')
+        print(f"average word count:{stats.average_word_count:.2f}")
+        for word, count in stats.top_terms(5):
             print(f"{word}:{count}")
-    def get_related_documents(self, document_index):
+    def get_related_documents(self, document_index, top_n=None):
+        """
+        Titles of documents related to self.documents[document_index].
+
+        With embeddings this is a lookup in the kNN graph (built on first
+        use); otherwise documents sharing the cluster_id.
+        """
         if document_index >= len(self.documents):
             return []
-        
-        target_cluster = self.documents[document_index].cluster_id
+
+        doc = self.documents[document_index]
+        if self.knn_graph is None and getattr(self, "vector_index", None) is not None and len(self.vector_index):
+            self.build_knn_graph()
+        if self.knn_graph is not None and doc.doc_id in self.knn_graph:
+            return [
+                self._by_id[doc_id].title
+                for doc_id, _ in self.knn_graph.neighbors(doc.doc_id, top_n)
+                if doc_id in self._by_id
+            ]
+
+        target_cluster = doc.cluster_id
 
         related = [
             doc.title
@@ -118,7 +458,10 @@ class DocumentManager:
                    model_name or "all-MiniLM-L6-v2"
                )
                print("Transformer embedder initialized")
-               self.document_vectors = {}
+               self._reset_vector_index()
+               self.document_vectors = IndexVectorView(self.vector_index, {})
+               self._bump_corpus_version()
+               self._init_embedding_cache()
                return True
            except Exception as e:
                print(f"failed to initialize trasformer embedder: {e}")
@@ -133,7 +476,10 @@ class DocumentManager:
                 model_name or "glove-twitter-25"
             )
             print("GloVe embedder initialized")
-            self.document_vectors = {}
+            self._reset_vector_index()
+            self.document_vectors = IndexVectorView(self.vector_index, {})
+            self._bump_corpus_version()
+            self._init_embedding_cache()
             return True
 
         else:
@@ -149,19 +495,159 @@ class DocumentManager:
         if 0 <= doc_index < len(self.documents):
             doc = self.documents[doc_index]
             if use_semantic and hasattr(self, 'semantic_summarizer'):
+                if doc.doc_id in self._summaries and not self.artifacts.is_stale("summary", doc):
+                    return self._summaries[doc.doc_id]
                 summary_data = self.semantic_summarizer.summarize_document(doc)
-                return summary_data["summary"] if summary_data else "could not generate semantic summary"
+                if not summary_data:
+                    return "could not generate semantic summary"
+                self._summaries[doc.doc_id] = summary_data["summary"]
+                self.artifacts.mark("summary", [doc])
+                return summary_data["summary"]
             else:
                 return "Summarizer not avilable"
         return "invalid document index"
-    def compute_all_embeddings(self):
+    def _init_embedding_cache(self):
+        cache_dir = os.path.join(os.path.dirname(self.storage_file) or ".", "embedding_cache")
+        try:
+            self.embedding_cache = EmbeddingCache(cache_dir, self.embedder.model_name)
+        except Exception as e:
+            print(f"Embedding cache unavailable: {e}")
+            self.embedding_cache = None
+    def compute_all_embeddings(self, use_cache=True):
         if not hasattr(self,'embedder'):
             print("Embedder not initialized. Call init_embedder() first")
             return
-        for doc in self.documents:
-            vector = self.embedder.document_to_vector(doc.content)
-            self.document_vectors[doc.title] = vector
-        print(f" Computed embeddings for {len(self.document_vectors) } documents")
+        self._ensure_indexed()
+        # snapshot, documents may still be streaming in from a background load
+        documents = list(self.documents)
+        cache = getattr(self, "embedding_cache", None) if use_cache else None
+        texts = [doc.content for doc in documents]
+        vectors = cache.get_many(texts) if cache is not None else [None] * len(texts)
+
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing and hasattr(self.embedder, "encode_batch"):
+            encoded = self.embedder.encode_batch([texts[i] for i in missing], verbose=True)
+            for i, vector in zip(missing, encoded):
+                vectors[i] = vector
+        else:
+            for i in missing:
+                vectors[i] = self.embedder.document_to_vector(texts[i])
+        if cache is not None and missing:
+            cache.put_many([texts[i] for i in missing], [vectors[i] for i in missing])
+
+        self._reset_vector_index()
+        self.vector_index.build([doc.doc_id for doc in documents], vectors)
+        # titles resolve to rows of the index instead of keeping a second
+        # float32 array per document
+        self.document_vectors = IndexVectorView(
+            self.vector_index,
+            {doc.title: row for row, doc in enumerate(documents)}
+        )
+        if isinstance(self.vector_index, QuantizedVectorIndex):
+            print(f" Quantized index ({self.vector_precision}): "
+                  f"{self.vector_index.memory_bytes() / 1e6:.1f} MB in memory")
+        if getattr(self, "ann_index", None) is not None:
+            self.ann_index.build(self.vector_index.ids, self.vector_index.float_matrix(), self.ann_index.n_lists)
+        if self.knn_graph is not None:
+            self.knn_graph.build(self.vector_index)
+        self.artifacts.clear("embedding")
+        self.artifacts.mark("embedding", documents)
+        self._bump_corpus_version()
+        print(f" Computed embeddings for {len(self.document_vectors) } documents "
+              f"({len(documents) - len(missing)} from cache)")
+    def _new_vector_index(self, rescore=True):
+        """Create an empty index for `self.vector_precision`."""
+        if self.vector_precision == "float32":
+            return VectorIndex()
+        rescore_dir = None
+        if rescore:
+            # the index creates (and deletes) its own file in here
+            rescore_dir = os.path.join(os.path.dirname(self.storage_file) or ".", "embedding_cache")
+        return QuantizedVectorIndex(self.vector_precision, rescore_dir=rescore_dir)
+    def _reset_vector_index(self):
+        """Replace the vector index with an empty one, releasing the old one's rescore file."""
+        old = getattr(self, "vector_index", None)
+        if old is not None and hasattr(old, "close"):
+            old.close()
+        self.vector_index = self._new_vector_index()
+    def init_ann_index(self, n_lists=None, nprobe=8, index_file=None):
+        """
+        Build an IVF approximate index over the current embeddings.
+
+        Args:
+            n_lists: Number of inverted lists (defaults to sqrt(N))
+            nprobe: Lists scanned per query; higher means better recall
+            index_file: Optional .npz path to load from / save to. A saved
+                index is only used if its rows still match the current
+                documents (by file_path and content fingerprint);
+                otherwise it is rebuilt and overwritten.
+        """
+        if index_file and os.path.exists(index_file):
+            index = IVFIndex.load(index_file)
+            ids = self._match_index_keys(index.keys)
+            if ids is not None:
+                # doc ids are assigned in load order, so remap to this session's ids
+                index.relabel(ids)
+                index.nprobe = nprobe
+                self.ann_index = index
+                self._bump_corpus_version()
+                print(f"Loaded ANN index with {len(self.ann_index)} vectors from {index_file}")
+                return True
+            print(f"ANN index in {index_file} does not match the current documents; rebuilding")
+        if not hasattr(self, "vector_index") or len(self.vector_index) == 0:
+            print("No embeddings to index. Call compute_all_embeddings() first")
+            return False
+        self.ann_index = IVFIndex(n_lists=n_lists, nprobe=nprobe)
+        self.ann_index.build(self.vector_index.ids, self.vector_index.float_matrix(), n_lists)
+        if index_file:
+            self.ann_index.save(index_file, keys=[
+                (self._by_id[doc_id].file_path or "", self._by_id[doc_id].fingerprint)
+                for doc_id in self.ann_index.ids.tolist()
+            ])
+        self._bump_corpus_version()
+        print(f"ANN index built: {len(self.ann_index)} vectors in {self.ann_index.n_lists} lists")
+        return True
+    def _match_index_keys(self, keys):
+        """
+        Current doc ids for persisted (file_path, fingerprint) row keys,
+        or None unless they cover exactly the embedded documents.
+        """
+        index = getattr(self, "vector_index", None)
+        if keys is None or index is None or len(keys) != len(index):
+            return None
+        ids = []
+        for file_path, fingerprint in keys:
+            doc = self.get_document_by_path(file_path)
+            if doc is None or doc.fingerprint != fingerprint:
+                return None
+            ids.append(doc.doc_id)
+        if set(ids) != set(index.ids.tolist()) or len(set(ids)) != len(ids):
+            return None
+        return ids
+    def build_knn_graph(self, k=10):
+        """
+        Precompute the `k` nearest neighbours of every embedded document.
+
+        Kept up to date as documents are added, re-embedded or removed;
+        used by get_related_documents and find_similar_documents.
+        """
+        if getattr(self, "vector_index", None) is None or len(self.vector_index) == 0:
+            print("No embeddings to index. Call compute_all_embeddings() first")
+            return False
+        self.knn_graph = KNNGraph(k=k)
+        self.knn_graph.build(self.vector_index)
+        print(f"kNN graph built: {len(self.knn_graph)} documents, k={k}")
+        return True
+    def get_search_index(self, mode="exact"):
+        """Return the index used for `mode` ("exact" or "ann")."""
+        if mode == "ann":
+            if getattr(self, "ann_index", None) is None:
+                print("ANN index not built, falling back to exact search")
+                return self.vector_index
+            return self.ann_index
+        if mode != "exact":
+            raise ValueError(f"Unknown search mode: {mode}")
+        return self.vector_index
     def visualize_cluster(self):
         if not hasattr(self, "tfidf_matrix"):
             print("vectorize document first")
@@ -196,18 +682,10 @@ class DocumentManager:
     def add_document(self,):
         if os.path.exists(self.storage_file):
             try:
-                with open(self.storage_file, "r") as f:
-                    data = json.load(f)
-                    for entry in data:
-                        if not any(doc.file_path == entry["file_path"] for doc in self.documents):
-                            doc = Document(
-                                title=entry["title"],
-                                content=entry["content"],
-                                file_path=entry["file_path"],
-                                ingestion_date=entry["ingestion_date"],
-                                document_type=None
-                            )
-                            self.documents.append(doc)
+                for entry in iter_json_array(self.storage_file):
+                    if not self.has_document(entry.get("file_path", "")):
+                        # same as the initial load: compressed records carry content_z / codec
+                        self._append_document(entry_to_document(entry))
                 print(f"Loaded {len(self.documents)} document(s) from {self.storage_file}.")
             except json.JSONDecodeError:
                 print(f"Warning: {self.storage_file} is empty or malformed. Starting fresh.")
@@ -223,69 +701,364 @@ class DocumentManager:
                 print(f"{i+1}.{doc}")
             print("-------------------------\n")
     
+    def _to_record(self, doc):
+        # compresses into the record only; the live document is left as is
+        return doc.to_dict(self.compression)
+
     def save_to_json(self,file_name, append=False):
-        # data = [doc.__dict__ for doc in self.documents]
+        """
+        Write the documents to `file_name` via temp file + atomic rename.
 
-        if append and os.path.exists(file_name):
-            with open(file_name,"r") as f:
+        The document list is snapshotted under the index lock and
+        serialized outside it, so readers are not blocked by a large save.
+        Saving to the storage file is a checkpoint and clears the WAL.
+        """
+        def records():
+            seen = set()
+            if append and os.path.exists(file_name):
                 try:
-                    data = json.load(f)
+                    for item in iter_json_array(file_name):
+                        seen.add(item.get("file_path"))
+                        yield item
                 except json.JSONDecodeError:
-                    data = []
-            existing_path = {item.get("file_path") for item in data}
-            for doc in self.documents:
-                if doc.file_path not in existing_path:
-                   data.append(doc.__dict__)
-        else: 
-            data = [doc.__dict__ for doc in self.documents]
-        with open(file_name,"w") as f:
-            json.dump(data,f,indent=4)
-        print(f"Saved {len(self.documents)} document(s) to {file_name}")
+                    print(f"Warning: {file_name} is malformed; rewriting it from memory.")
+            for doc in documents:
+                if doc.file_path not in seen:
+                    yield self._to_record(doc)
+
+        with self._save_lock:
+            # WAL appends wait for the save, so none is lost by the reset below
+            with self._index_lock:
+                documents = list(self.documents)
+            # base64 content gains nothing from pretty-printing
+            count = write_json_array(file_name, records(), indent=None if self.compression else 4)
+            if self.wal is not None and os.path.abspath(file_name) == os.path.abspath(self.storage_file):
+                self.wal.reset()
+        print(f"Saved {count} document(s) to {file_name}")
+
+    def checkpoint(self):
+        """Fold the write-ahead log into the storage file (JSON backend)."""
+        if self.wal is None:
+            return
+        self.wait_until_loaded()
+        self.save_to_json(self.storage_file)
+
+    def _log_mutations(self, records):
+        with self._save_lock:
+            self.wal.append(records)
+        if len(self.wal) >= self.wal_checkpoint_records:
+            self.checkpoint()
+
+    def _replay_wal(self):
+        """Re-apply mutations logged after the last checkpoint."""
+        replayed = 0
+        for record in self.wal.records():
+            if record.get("op") == "put":
+                doc = entry_to_document(record["doc"])
+                existing = self.get_document_by_path(doc.file_path)
+                if existing is not None:
+                    if existing.fingerprint == doc.fingerprint:
+                        continue
+                    self.remove_document(existing.doc_id, persist=False)
+                self._append_document(doc)
+            elif record.get("op") == "delete":
+                existing = self.get_document_by_path(record.get("key"))
+                if existing is None:
+                    continue
+                self.remove_document(existing.doc_id, persist=False)
+            replayed += 1
+        if replayed:
+            print(f"Replayed {replayed} mutation(s) from {self.wal.path}")
+
+    def insert_document(self, doc, persist=True):
+        """Add a new Document and persist it to the configured backend."""
+        self._append_document(doc)
+        if persist:
+            if self.store is not None:
+                self.store.put(self._to_record(doc))
+            else:
+                self._log_mutations([{"op": "put", "doc": self._to_record(doc)}])
+
+    def add_documents(self, docs, vectors=None):
+        """Append a batch of documents and, if given, their embeddings (not persisted)."""
+        with self._index_lock:
+            for doc in docs:
+                self._append_document(doc)
+        if vectors is None or getattr(self, "vector_index", None) is None:
+            return
+        self._add_vectors(docs, vectors)
+        cache = getattr(self, "embedding_cache", None)
+        if cache is not None:
+            cache.put_many([doc.content for doc in docs], vectors)
+
+    def _add_vectors(self, docs, vectors):
+        ids = [doc.doc_id for doc in docs]
+        first_row = len(self.vector_index)
+        self.vector_index.add_batch(ids, vectors)
+        if getattr(self, "ann_index", None) is not None:
+            self.ann_index.add_batch(ids, vectors)
+        if self.knn_graph is not None:
+            self.knn_graph.add(self.vector_index, ids, vectors)
+        for row, doc in enumerate(docs, start=first_row):
+            self.document_vectors.rows[doc.title] = row
+        self.artifacts.mark("embedding", docs)
+        self._bump_corpus_version()
+
+    def _sync_vector_rows(self):
+        # index rows shift when documents are removed
+        if isinstance(getattr(self, "document_vectors", None), IndexVectorView):
+            self.document_vectors.rows = {
+                self._by_id[doc_id].title: row
+                for row, doc_id in enumerate(self.vector_index.ids.tolist())
+                if doc_id in self._by_id
+            }
+
+    def stale_artifacts(self):
+        """Number of documents whose embedding / TF-IDF row / difficulty / cluster / summary is out of date."""
+        self._ensure_indexed()
+        return self.artifacts.summary(self.documents)
+
+    def refresh(self, artifacts=None):
+        """
+        Recompute only the derived artifacts whose document content changed
+        (or that were never built for a document). Only artifacts that
+        have been built before are refreshed.
+        """
+        self._ensure_indexed()
+        documents = list(self.documents)
+        artifacts = artifacts or ArtifactTracker.ARTIFACTS
+        refreshed = {}
+
+        if "embedding" in artifacts and getattr(self, "vector_index", None) is not None and len(self.vector_index):
+            stale = self.artifacts.stale("embedding", documents)
+            if stale:
+                self._refresh_embeddings(stale)
+            refreshed["embedding"] = len(stale)
+
+        if "tfidf" in artifacts and self.tfidf_engine.tfidf_matrix is not None:
+            stale = self.artifacts.stale("tfidf", documents)
+            if stale or len(documents) != self.tfidf_engine.tfidf_matrix.shape[0]:
+                self.tfidf_engine.update(documents, {doc.doc_id for doc in stale})
+                self.artifacts.mark("tfidf", stale)
+            refreshed["tfidf"] = len(stale)
+
+        if "cluster" in artifacts and self.artifacts.built("cluster"):
+            stale = self.artifacts.stale("cluster", documents)
+            if stale:
+                # nearest existing centroid; cluster_documents() refits the clusters
+                for doc, label in zip(stale, self.tfidf_engine.predict_clusters(stale)):
+                    doc.cluster_id = label
+                self.artifacts.mark("cluster", stale)
+                self.update_metadata(stale)
+            refreshed["cluster"] = len(stale)
+
+        if "bm25" in artifacts and self._keyword_index is not None:
+            stale = self.artifacts.stale("bm25", documents)
+            with self._index_lock:
+                for doc in stale:
+                    self._keyword_index.add(doc.doc_id, doc.token_ids)
+            self.artifacts.mark("bm25", stale)
+            refreshed["bm25"] = len(stale)
+
+        if "difficulty" in artifacts and self.artifacts.built("difficulty"):
+            stale = self.artifacts.stale("difficulty", documents)
+            if stale:
+                scores, labels = difficulty_scores(
+                    difficulty_feature_matrix(stale, cache=self._difficulty_features)
+                )
+                for doc, score, label in zip(stale, scores.tolist(), labels):
+                    doc.difficulty_score = score
+                    doc.difficulty_label = label
+                self.artifacts.mark("difficulty", stale)
+                self.update_metadata(stale)
+            refreshed["difficulty"] = len(stale)
+
+        if "summary" in artifacts:
+            stale = self.artifacts.stale("summary", documents)
+            for doc in stale:
+                self._summaries.pop(doc.doc_id, None)
+                summary_data = None
+                if hasattr(self, "semantic_summarizer"):
+                    summary_data = self.semantic_summarizer.summarize_document(doc)
+                if summary_data:
+                    self._summaries[doc.doc_id] = summary_data["summary"]
+                    self.artifacts.mark("summary", [doc])
+            refreshed["summary"] = len(stale)
+
+        # drop cached difficulty rows of content that no longer exists
+        live = {doc.fingerprint for doc in documents}
+        for key in [key for key in self._difficulty_features if key not in live]:
+            del self._difficulty_features[key]
+
+        # corpus statistics and the filter bitmaps follow edits as well
+        with self._index_lock:
+            if self._corpus_stats is not None:
+                for doc in documents:
+                    if not self._corpus_stats.update(doc):
+                        # seeded from a map-reduce pass; rebuilt on next use
+                        self._corpus_stats = None
+                        break
+        self.update_metadata()
+
+        print(f"Refreshed: {refreshed}")
+        return refreshed
+
+    def _refresh_embeddings(self, docs):
+        texts = [doc.content for doc in docs]
+        cache = getattr(self, "embedding_cache", None)
+        vectors = cache.get_many(texts) if cache is not None else [None] * len(texts)
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing and hasattr(self.embedder, "encode_batch"):
+            for i, vector in zip(missing, self.embedder.encode_batch([texts[i] for i in missing])):
+                vectors[i] = vector
+        else:
+            for i in missing:
+                vectors[i] = self.embedder.document_to_vector(texts[i])
+        if cache is not None and missing:
+            cache.put_many([texts[i] for i in missing], [vectors[i] for i in missing])
+
+        ids = [doc.doc_id for doc in docs]
+        self.vector_index.remove(ids)
+        if getattr(self, "ann_index", None) is not None:
+            self.ann_index.remove(ids)
+        self._sync_vector_rows()
+        self._add_vectors(docs, vectors)
+
+    def persist_documents(self, docs):
+        """Write `docs` to the configured backend in one batch."""
+        if self.store is not None:
+            self.store.put_many([self._to_record(doc) for doc in docs])
+            print(f"Appended {len(docs)} document(s) to {self.storage_file}")
+        else:
+            self._log_mutations([{"op": "put", "doc": self._to_record(doc)} for doc in docs])
+            print(f"Logged {len(docs)} document(s) to {self.wal.path}")
+
+    def ingest_directory(self, path, read_workers=None, batch_size=64, queue_size=256,
+                         embed=True, update_tfidf=True):
+        """
+        Bulk-ingest every supported file under `path` (see core/ingest.py).
+
+        Embeds each batch if an embedder is initialized, persists once at
+        the end and refits TF-IDF. Returns the run statistics.
+        """
+        pipeline = IngestPipeline(
+            self, read_workers=read_workers, batch_size=batch_size, queue_size=queue_size,
+            embed=embed, update_tfidf=update_tfidf
+        )
+        return pipeline.run(path)
+
+    def save_documents(self):
+        """
+        Persist documents that are not yet in storage.
+
+        With the log backend this appends one line per new document
+        instead of rewriting the whole file; with the JSON backend it is a
+        checkpoint.
+        """
+        if self.store is None:
+            self.checkpoint()
+            return
+        new_docs = [self._to_record(doc) for doc in self.documents if doc.file_path not in self.store]
+        self.store.put_many(new_docs)
+        print(f"Appended {len(new_docs)} document(s) to {self.storage_file}")
+
+    def compact_storage(self):
+        if self.store is not None:
+            self.store.compact()
+
+    def find_documents(self, title=None, file_path=None, document_type=None, date_from=None, date_to=None):
+        """
+        Look up documents by metadata.
+
+        The SQLite backend answers from its indexes; the other backends
+        filter the in-memory list. Dates compare as ISO strings.
+        """
+        if isinstance(self.store, SQLiteDocumentStore):
+            # map rows back to the loaded Document objects by file_path
+            found = self.store.find(title, file_path, document_type, date_from, date_to)
+            return [self.get_document_by_path(doc.file_path) or doc for doc in found]
+        return [
+            doc for doc in self.documents
+            if (title is None or doc.title == title)
+            and (file_path is None or doc.file_path == file_path)
+            and (document_type is None or doc.document_type == document_type)
+            and (date_from is None or (doc.ingestion_date or "") >= date_from)
+            and (date_to is None or (doc.ingestion_date or "") <= date_to)
+        ]
 
     def load_from_json(self, file_name):
         if  not os.path.exists(file_name):
             print('No json file found')
             return
         try:
-            with open(file_name, "r") as f:
-                data = json.load(f)
-                for entry in data:
-                    doc = Document(
-                        title=entry["title"],
-                        content=entry["content"],
-                        file_path=entry["file_path"],
-                        ingestion_date=entry["ingestion_date"]
-                    )
-                    self.documents.append(doc)
+            for doc in iter_documents(file_name):
+                self._append_document(doc)
         except Exception as e:
             print(f"Error loading json {e}")
 
-    def _load_initial_documents(self):
-        """Private method to load documents on initialization."""
-        if os.path.exists(self.storage_file):
-            try:
-                with open(self.storage_file, "r") as f:
-                    data = json.load(f)
-                    for entry in data:
-                        # Handle both "Content" and "content" for backward compatibility
-                        content = entry.get("content") or entry.get("Content", "")
-                        
-                        doc = Document(
-                            title=entry.get("title", ""),
-                            content=content,
-                            file_path=entry.get("file_path", ""),
-                            ingestion_date=entry.get("ingestion_date", ""),
-                            document_type=entry.get("document_type")
-                        )
-                        self.documents.append(doc)
-                print(f"Loaded {len(self.documents)} document(s) from storage file.")
-            except json.JSONDecodeError:
-                print(f"Storage file '{self.storage_file}' is empty or corrupted.")
-        else:
+    def _load_initial_documents(self, initial_limit=None):
+        """
+        Private method to load documents on initialization.
+
+        Documents are parsed one at a time from the storage file. With
+        `initial_limit`, only the first N are loaded before returning and
+        the rest are appended by a background thread; call
+        wait_until_loaded() to block until they are all in. With the JSON
+        backend the write-ahead log is replayed once the file is loaded.
+        """
+        self.loading_complete = threading.Event()
+        if self.store is None and os.path.exists(self.storage_file + ".tmp"):
+            # an interrupted save; the storage file itself is still intact
+            os.remove(self.storage_file + ".tmp")
+        if self.store is not None:
+            entries = self.store.documents()
+        elif not os.path.exists(self.storage_file):
             print(f"No storage file found at '{self.storage_file}'. Starting fresh.")
+            self._finish_loading()
+            return
+        else:
+            entries = iter_documents(self.storage_file)
+        try:
+            for doc in islice(entries, initial_limit):
+                self._append_document(doc)
+        except json.JSONDecodeError:
+            print(f"Storage file '{self.storage_file}' is empty or corrupted.")
+            self._finish_loading()
+            return
+        print(f"Loaded {len(self.documents)} document(s) from storage file.")
+
+        if initial_limit is not None and len(self.documents) >= initial_limit:
+            self._loader_thread = threading.Thread(
+                target=self._load_remaining_documents,
+                args=(entries,),
+                daemon=True
+            )
+            self._loader_thread.start()
+        else:
+            self._finish_loading()
+
+    def _load_remaining_documents(self, entries):
+        try:
+            for doc in entries:
+                self._append_document(doc)
+            print(f"Background load finished: {len(self.documents)} document(s) available.")
+        except json.JSONDecodeError:
+            print(f"Storage file '{self.storage_file}' is corrupted after {len(self.documents)} document(s).")
+        finally:
+            self._finish_loading()
+
+    def _finish_loading(self):
+        try:
+            if self.wal is not None:
+                self._replay_wal()
+        finally:
+            self.loading_complete.set()
+
+    def wait_until_loaded(self, timeout=None):
+        """Block until background loading finishes; returns False on timeout."""
+        return self.loading_complete.wait(timeout)
 
     def prepare_difficlulty_training_data(self):
-        X = []
         Y = []
         for i, doc in enumerate(self.documents):
             # TEMPORARY manual labels for learning
@@ -295,9 +1068,9 @@ class DocumentManager:
                 doc.difficulty_label = "medium"
             else:
                 doc.difficulty_label = "hard"
-
-            X.append(extract_difficulty_features(doc))
             Y.append(doc.difficulty_label)
+        self.update_metadata()
+        X = self.difficulty_features()
         return X, Y
     def train_difficulty_model(self):
         from src.ssa.ml.difficulty_classifier import Difficulty_classifier
@@ -311,19 +1084,7 @@ class DocumentManager:
 
     print("✅ Difficulty model trained successfully")
     def predict_difficulty_ml(self, content):
-        from src.ssa.core.document import Document
-        from src.ssa.ml.features import extract_difficulty_features
-
-
-        temp_doc = Document(
-            title="temp",
-            content=content,
-            file_path="",
-            ingestion_date="",
-            document_type=None
-        )
-
-        features = [extract_difficulty_features(temp_doc)]
+        features = [list(token_stats(tokenize(content)))]
         return self.difficulty_model.predict(features)
     
     def init_week12_features(self):
@@ -345,6 +1106,7 @@ class DocumentManager:
         try:
             from src.ssa.ml.semantic_summarizer import SemanticSummarizer
             self.semantic_summarizer = SemanticSummarizer(self.embedder)
+            self._bump_corpus_version()
             print("Semantic summarizer initialized")
         except Exception as e:
             print(f"Failed to initialize semantic summarizer: {e}")
@@ -352,32 +1114,181 @@ class DocumentManager:
         print("🎉 Week 12 features initialized successfully!")
         return True  # ✅ Make sure this returns True!
         
-    def semantic_search(self, query: str, top_k: int = 5,threshold: float = 0.3):
-        if not hasattr(self,'embedder') or not hasattr(self,'document_vectors'):
+    def semantic_search(self, query: str, top_k: int = 5,threshold: float = 0.3, mode: str = "exact",
+                        filters: Optional[Dict] = None):
+        """
+        Args:
+            filters: metadata filters (see MetadataIndex.mask), applied
+                inside the scan before the top-k selection
+
+        Results are cached per (query, parameters, corpus version).
+        """
+        return self._cached_query(
+            "semantic", query, (top_k, threshold, mode, self._nprobe_key(mode), self._filter_key(filters)),
+            lambda: self._semantic_search(query, top_k, threshold, mode, filters)
+        )
+
+    def _semantic_search(self, query, top_k, threshold, mode, filters):
+        if not hasattr(self,'embedder') or not hasattr(self,'vector_index'):
             print("Semantic search not initialized. call init_week12_feature() first.")
             return []
         query_vector = self.embedder.encode(query)
         results = []
-        for title, doc_vector in self.document_vectors.items():
-
-            doc = next((d for d in self.documents if d.title == title), None)
-            if not doc:
+        # one matmul over the normalized matrix (or the probed IVF lists),
+        # top-k picked with argpartition
+        index = self.get_search_index(mode)
+        mask = self._filter_rows(filters, index.ids)
+        for doc_id, similarity in index.search(query_vector, top_k, threshold, mask):
+            doc = self.get_document(doc_id)
+            if doc is None:
                 continue
-            similarity = self.embedder.similarity(query_vector, doc_vector)
+            results.append({
+                "document":doc,
+                "title":doc.title,
+                "similarity": similarity,
+                "content_preview": self._preview(doc)
+            })
+
+        return results
 
-            if similarity >= threshold:
-                results.append({
-                    "document":doc,
-                    "title":doc.title,
+    def semantic_search_many(self, queries: List[str], top_k: int = 5, threshold: float = 0.3,
+                             mode: str = "exact", filters: Optional[Dict] = None) -> List[List[Dict]]:
+        """
+        semantic_search for a batch of queries.
+
+        All queries are encoded in one encode_batch call and scored with
+        matrix-matrix products against the index; returns one result
+        list per query, in order.
+        """
+        if not hasattr(self,'embedder') or not hasattr(self,'vector_index'):
+            print("Semantic search not initialized. call init_week12_feature() first.")
+            return [[] for _ in queries]
+        if not queries:
+            return []
+        if hasattr(self.embedder, "encode_batch"):
+            query_vectors = self.embedder.encode_batch(list(queries))
+        else:
+            query_vectors = np.array([self.embedder.encode(query) for query in queries])
+
+        index = self.get_search_index(mode)
+        mask = self._filter_rows(filters, index.ids)
+        results = []
+        for hits in index.search_many(query_vectors, top_k, threshold, mask=mask):
+            query_results = []
+            for doc_id, similarity in hits:
+                doc = self.get_document(doc_id)
+                if doc is None:
+                    continue
+                query_results.append({
+                    "document": doc,
+                    "title": doc.title,
                     "similarity": similarity,
-                    "content_preview": doc.content[:200] + "..." if len(doc.content) > 200 else doc.content
+                    "content_preview": self._preview(doc)
                 })
+            results.append(query_results)
+        return results
+
+    def faceted_search(self, query: str, filters: Optional[Dict] = None, top_k: int = 5,
+                       threshold: float = 0.3, mode: str = "exact") -> Dict:
+        """
+        Filtered semantic search plus facet counts of the filtered set.
+
+        The facets come from the same bitmaps as the search mask, so no
+        document is visited to count them.
+        """
+        return {
+            "results": self.semantic_search(query, top_k, threshold, mode, filters),
+            "facets": self.facet_counts(filters)
+        }
+
+    def _preview(self, doc):
+        content = doc.content
+        return content[:200] + "..." if len(content) > 200 else content
+
+    def keyword_search(self, query: str, top_k: int = 5, filters: Optional[Dict] = None):
+        """BM25 search over the inverted index; exact term matches only."""
+        results = []
+        index = self.keyword_index
+        mask = self._filter_rows(filters, index.ids)
+        for doc_id, score in index.search(query, top_k, mask):
+            doc = self.get_document(doc_id)
+            if doc is None:
+                continue
+            results.append({
+                "document": doc,
+                "title": doc.title,
+                "score": score,
+                "content_preview": self._preview(doc)
+            })
+        return results
+
+    def hybrid_search(self, query: str, top_k: int = 5, fusion: str = "rrf", alpha: float = 0.5,
+                      rrf_k: int = 60, threshold: float = 0.0, mode: str = "exact",
+                      filters: Optional[Dict] = None):
+        """
+        Fuse BM25 and semantic rankings.
 
-        results.sort(key=lambda x: x["similarity"], reverse=True)
+        Args:
+            fusion: "rrf" sums 1 / (rrf_k + rank) over both rankings;
+                "weighted" mixes max-normalized scores as
+                alpha * semantic + (1 - alpha) * bm25.
+            threshold: minimum cosine similarity for semantic candidates
+            filters: metadata filters applied to both rankings
 
-        return results[:top_k]
+        Falls back to keyword-only ranking if semantic search is not initialized.
+        """
+        return self._cached_query(
+            "hybrid", query,
+            (top_k, fusion, alpha, rrf_k, threshold, mode, self._nprobe_key(mode), self._filter_key(filters)),
+            lambda: self._hybrid_search(query, top_k, fusion, alpha, rrf_k, threshold, mode, filters)
+        )
+
+    def _hybrid_search(self, query, top_k, fusion, alpha, rrf_k, threshold, mode, filters):
+        if fusion not in ("rrf", "weighted"):
+            raise ValueError(f"Unknown fusion method: {fusion}")
+        candidates = top_k * 4
+        keyword = [(r["document"].doc_id, r["score"]) for r in self.keyword_search(query, candidates, filters)]
+        semantic = []
+        if hasattr(self, "embedder") and hasattr(self, "vector_index"):
+            semantic = [(r["document"].doc_id, r["similarity"])
+                        for r in self.semantic_search(query, candidates, threshold, mode, filters)]
+
+        fused = {}
+        for ranking, weight in ((semantic, alpha), (keyword, 1 - alpha)):
+            if not ranking:
+                continue
+            best = max(score for _, score in ranking) or 1.0
+            for rank, (doc_id, score) in enumerate(ranking, 1):
+                if fusion == "rrf":
+                    fused[doc_id] = fused.get(doc_id, 0.0) + 1.0 / (rrf_k + rank)
+                else:
+                    fused[doc_id] = fused.get(doc_id, 0.0) + weight * score / best
+
+        semantic_scores = dict(semantic)
+        keyword_scores = dict(keyword)
+        results = []
+        for doc_id in sorted(fused, key=fused.get, reverse=True)[:top_k]:
+            doc = self.get_document(doc_id)
+            if doc is None:
+                continue
+            results.append({
+                "document": doc,
+                "title": doc.title,
+                "score": fused[doc_id],
+                "similarity": semantic_scores.get(doc_id),
+                "bm25": keyword_scores.get(doc_id),
+                "content_preview": self._preview(doc)
+            })
+        return results
             
     def answer_question(self, question: str, use_semantic_summary: bool = True) -> Dict:
+        # repeated questions skip the search and the summarization
+        return self._cached_query(
+            "answer", question, (use_semantic_summary,),
+            lambda: self._answer_question(question, use_semantic_summary)
+        )
+
+    def _answer_question(self, question: str, use_semantic_summary: bool = True) -> Dict:
         # Step 1: Semantic search
         search_results = self.semantic_search(question, top_k=3, threshold=0.25)
         
@@ -492,24 +1403,14 @@ class DocumentManager:
         print(f"\n🔍 Comparing Search Methods for: '{query}'")
         print("=" * 60)
         
-        # Week 11: Keyword-based search (using your existing AnswerExtractor)
-        print("\n📝 Week 11 - Keyword-based Search:")
+        # Week 11: Keyword-based search (BM25 over the inverted index)
+        print("\n📝 Week 11 - Keyword-based Search (BM25):")
         print("-" * 40)
         
-        try:
-            from src.ssa.qa.answer_extractor import AnswerExtractor
-            extractor = AnswerExtractor()
-            
-            # Mock documents for comparison
-            mock_docs = [(doc, 1.0) for doc in self.documents]
-            keyword_results = extractor.extract_answers(query, mock_docs, max_answers=3)
-            
-            for i, (answer, score, source) in enumerate(keyword_results[:3], 1):
-                print(f"{i}. Score: {score:.3f}")
-                print(f"   Source: {source}")
-                print(f"   Answer: {answer[:100]}...")
-        except Exception as e:
-            print(f"   Keyword search not available: {e}")
+        for i, result in enumerate(self.keyword_search(query, top_k=3), 1):
+            print(f"{i}. Score: {result['score']:.3f}")
+            print(f"   Source: {result['title']}")
+            print(f"   Preview: {result['content_preview'][:100]}...")
         
         # Week 12: Semantic search
         print("\n🤖 Week 12 - Semantic Search:")
@@ -521,6 +1422,14 @@ class DocumentManager:
             print(f"{i}. Score: {result['similarity']:.3f}")
             print(f"   Source: {result['title']}")
             print(f"   Preview: {result['content_preview'][:100]}...")
+
+        print("\n🔀 Hybrid (BM25 + Semantic, reciprocal rank fusion):")
+        print("-" * 40)
+
+        for i, result in enumerate(self.hybrid_search(query, top_k=3), 1):
+            print(f"{i}. Score: {result['score']:.4f}")
+            print(f"   Source: {result['title']}")
+            print(f"   Preview: {result['content_preview'][:100]}...")
         
         print("\n" + "=" * 60)
 
@@ -572,8 +1481,9 @@ class DocumentManager:
         print("\n🚀 Week 13: Initializing DistilGPT2 LLM...")
         
         try:
-            from transformers import pipeline
-            self.gpt2 = pipeline("text-generation", model="distilgpt2")
+            from src.ssa.ml.model_registry import shared_pipeline
+            self.gpt2 = shared_pipeline("text-generation", "distilgpt2")
+            self.gpt2.get()
             print("✅ DistilGPT2 LLM ready!")
             print("   Model: distilgpt2 (82M parameters)")
             print("   Status: Fast & reliable")
@@ -0,0 +1,150 @@
+import numpy as np
+
+
+class MetadataIndex:
+    """
+    Precomputed bitmaps over document metadata for filtered search.
+
+    For each field, every distinct value gets a code and a boolean
+    bitmap indexed by doc_id. A filter is a few ORs/ANDs of those
+    bitmaps; gathering the result at an index's row ids gives the mask
+    applied before its top-k selection. Date ranges select the matching
+    distinct dates (ISO strings, compared as strings like
+    find_documents) and OR their bitmaps. Facet counts are a bincount of
+    the per-document codes under the same mask.
+    """
+
+    FIELDS = ("document_type", "ingestion_date", "difficulty_label", "cluster_id")
+    FILTERS = ("document_type", "difficulty_label", "cluster_id", "date_from", "date_to")
+
+    def __init__(self, capacity: int = 64):
+        self._capacity = capacity
+        self._present = np.zeros(capacity, dtype=bool)
+        self._codes = {field: np.full(capacity, -1, dtype=np.int32) for field in self.FIELDS}
+        self._values = {field: [] for field in self.FIELDS}
+        self._value_codes = {field: {} for field in self.FIELDS}
+        self._bitmaps = {field: [] for field in self.FIELDS}
+
+    def __len__(self):
+        return int(np.count_nonzero(self._present))
+
+    def _reserve(self, doc_id: int):
+        if doc_id < self._capacity:
+            return
+        capacity = max(2 * self._capacity, doc_id + 1)
+
+        def grow(array, fill):
+            grown = np.full(capacity, fill, dtype=array.dtype)
+            grown[:self._capacity] = array
+            return grown
+
+        self._present = grow(self._present, False)
+        for field in self.FIELDS:
+            self._codes[field] = grow(self._codes[field], -1)
+            self._bitmaps[field] = [grow(bitmap, False) for bitmap in self._bitmaps[field]]
+        self._capacity = capacity
+
+    def _code(self, field, value):
+        codes = self._value_codes[field]
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(self._values[field])
+            self._values[field].append(value)
+            self._bitmaps[field].append(np.zeros(self._capacity, dtype=bool))
+        return code
+
+    def add(self, doc):
+        """Index (or re-index) the metadata of `doc`."""
+        doc_id = doc.doc_id
+        self._reserve(doc_id)
+        self._clear(doc_id)
+        self._present[doc_id] = True
+        for field in self.FIELDS:
+            value = getattr(doc, field)
+            if value is None:
+                continue
+            if isinstance(value, np.integer):
+                # cluster labels come out of sklearn as numpy ints
+                value = int(value)
+            code = self._code(field, value)
+            self._codes[field][doc_id] = code
+            self._bitmaps[field][code][doc_id] = True
+
+    def add_documents(self, documents):
+        for doc in documents:
+            self.add(doc)
+
+    def _clear(self, doc_id):
+        for field in self.FIELDS:
+            code = self._codes[field][doc_id]
+            if code >= 0:
+                self._bitmaps[field][code][doc_id] = False
+                self._codes[field][doc_id] = -1
+        self._present[doc_id] = False
+
+    def remove(self, doc_ids):
+        for doc_id in doc_ids:
+            if 0 <= doc_id < self._capacity:
+                self._clear(doc_id)
+
+    def _field_mask(self, field, values):
+        if field == "ingestion_date":
+            date_from, date_to = values
+            codes = [
+                code for code, value in enumerate(self._values[field])
+                if (date_from is None or (value or "") >= date_from)
+                and (date_to is None or (value or "") <= date_to)
+            ]
+        else:
+            if isinstance(values, (str, bytes)) or not hasattr(values, "__iter__"):
+                values = [values]
+            codes = [self._value_codes[field][value] for value in values if value in self._value_codes[field]]
+        mask = np.zeros(self._capacity, dtype=bool)
+        for code in codes:
+            mask |= self._bitmaps[field][code]
+        return mask
+
+    def mask(self, filters=None) -> np.ndarray:
+        """
+        Boolean mask over doc_id of the documents matching `filters`.
+
+        Args:
+            filters: dict with any of document_type, difficulty_label,
+                cluster_id (a value or a list of accepted values) and
+                date_from / date_to (inclusive ISO date strings).
+                Keys set to None are ignored.
+        """
+        filters = {key: value for key, value in (filters or {}).items() if value is not None}
+        unknown = set(filters) - set(self.FILTERS)
+        if unknown:
+            raise ValueError(f"Unknown filter field(s): {', '.join(sorted(unknown))}")
+        mask = self._present.copy()
+        for field in ("document_type", "difficulty_label", "cluster_id"):
+            if field in filters:
+                mask &= self._field_mask(field, filters[field])
+        if "date_from" in filters or "date_to" in filters:
+            mask &= self._field_mask("ingestion_date", (filters.get("date_from"), filters.get("date_to")))
+        return mask
+
+    def rows(self, mask: np.ndarray, ids) -> np.ndarray:
+        """Gather a doc_id mask at the row ids of an index (ids outside the mask are False)."""
+        ids = np.asarray(ids, dtype=np.int64)
+        valid = (ids >= 0) & (ids < len(mask))
+        rows = np.zeros(len(ids), dtype=bool)
+        rows[valid] = mask[ids[valid]]
+        return rows
+
+    def facets(self, mask: np.ndarray = None):
+        """{field: {value: count}} over the documents selected by `mask` (default: all)."""
+        if mask is None:
+            mask = self._present
+        facets = {}
+        for field in self.FIELDS:
+            codes = self._codes[field][mask]
+            counts = np.bincount(codes[codes >= 0], minlength=len(self._values[field]))
+            facets[field] = {
+                value: int(count)
+                for value, count in zip(self._values[field], counts.tolist())
+                if count
+            }
+        return facets
@@ -0,0 +1,61 @@
+"""
+Map-reduce corpus analytics on a process pool.
+
+Documents are split into shards of plain content strings. Each worker
+tokenizes its shard and returns a partial term Counter together with
+per-document word counts and difficulty features. The parent merges the
+partial results in shard order.
+"""
+
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from src.ssa.core.document import token_stats, tokenize
+
+
+def _analyze_shard(contents, count_terms=True):
+    """Map step: (term Counter, (n, 4) difficulty features) for one shard."""
+    terms = Counter()
+    features = np.zeros((len(contents), 4), dtype=np.float64)
+    for row, content in enumerate(contents):
+        tokens = tokenize(content)
+        if count_terms:
+            terms.update(tokens)
+        features[row] = token_stats(tokens)
+    return terms, features
+
+
+def shard_difficulty_features(contents):
+    """(n, 4) difficulty features of raw texts, for a process pool worker."""
+    return _analyze_shard(contents, count_terms=False)[1]
+
+
+def map_reduce_analytics(documents, workers=None, shard_size=None):
+    """
+    Tokenize and profile `documents` across a ProcessPoolExecutor.
+
+    Returns {"term_counts": Counter, "features": (N, 4) array}, with
+    feature rows in the same order as `documents` (word count is column 0).
+    """
+    contents = [doc.content or "" for doc in documents]
+    workers = workers or os.cpu_count() or 1
+    if shard_size is None:
+        # a few shards per worker keeps the pool busy when shard costs differ
+        shard_size = max(1, -(-len(contents) // (workers * 4)))
+    shards = [contents[i:i + shard_size] for i in range(0, len(contents), shard_size)]
+
+    if workers == 1 or len(shards) <= 1:
+        results = [_analyze_shard(shard) for shard in shards]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_analyze_shard, shards))
+
+    # reduce step
+    term_counts = Counter()
+    for terms, _ in results:
+        term_counts.update(terms)
+    features = np.concatenate([block for _, block in results]) if results else np.zeros((0, 4))
+    return {"term_counts": term_counts, "features": features}
@@ -0,0 +1,278 @@
+import os
+import tempfile
+import weakref
+from collections.abc import Mapping
+
+import numpy as np
+
+from src.ssa.core.vector_index import VectorIndex
+
+
+class QuantizedVectorIndex(VectorIndex):
+    """
+    Vector index that keeps only compressed codes in memory.
+
+    precision="float16" halves the matrix; precision="int8" stores each
+    dimension as a scalar-quantized byte (per-dimension min/scale), a 4x
+    saving. The candidate scan runs on the codes. If `rescore_file` is
+    given, the float32 rows are also written to that memory-mapped file
+    and the best `top_k * rescore_factor` candidates are re-ranked
+    exactly from it. With `rescore_dir` instead, the index creates its
+    own uniquely named file there, so indexes sharing a directory never
+    overwrite each other's rows, and deletes it on close() or when the
+    index is garbage collected.
+    """
+
+    PRECISIONS = {"float16": np.float16, "int8": np.int8}
+
+    def __init__(self, precision: str = "int8", dim: int = None, capacity: int = 64,
+                 rescore_file: str = None, rescore_factor: int = 4, rescore_dir: str = None):
+        if precision not in self.PRECISIONS:
+            raise ValueError(f"Unknown precision: {precision}. Use 'float16' or 'int8'")
+        super().__init__(dim, capacity)
+        self.precision = precision
+        self.dtype = self.PRECISIONS[precision]
+        self.rescore_file = rescore_file
+        self.rescore_factor = rescore_factor
+        self.scale = None
+        self.offset = None
+        self._full = None
+        self._cleanup = None
+        if rescore_file is None and rescore_dir is not None:
+            os.makedirs(rescore_dir, exist_ok=True)
+            fd, self.rescore_file = tempfile.mkstemp(
+                prefix=f"vectors.{precision}.", suffix=".f32", dir=rescore_dir
+            )
+            os.close(fd)
+            self._cleanup = weakref.finalize(self, _remove_file, self.rescore_file)
+
+    def close(self):
+        """Stop rescoring and delete the rescore file if this index created it."""
+        if self._full is not None:
+            self._full.flush()
+        self._full = None
+        if self._cleanup is not None:
+            self._cleanup()
+            self.rescore_file = None
+
+    def _reserve(self, extra: int):
+        needed = self._size + extra
+        if self._matrix is not None and needed <= len(self._matrix):
+            return
+        capacity = max(self._capacity, needed, 2 * self._size)
+        codes = np.zeros((capacity, self.dim), dtype=self.dtype)
+        ids = np.zeros(capacity, dtype=np.int64)
+        fresh = self._matrix is None
+        if not fresh:
+            codes[:self._size] = self._matrix[:self._size]
+            ids[:self._size] = self._ids[:self._size]
+        self._matrix = codes
+        self._ids = ids
+
+        if self.rescore_file:
+            if self._full is not None:
+                self._full.flush()
+            self._full = None
+            os.makedirs(os.path.dirname(self.rescore_file) or ".", exist_ok=True)
+            if fresh and os.path.exists(self.rescore_file):
+                os.remove(self.rescore_file)
+            open(self.rescore_file, "ab").close()
+            os.truncate(self.rescore_file, capacity * self.dim * np.dtype(np.float32).itemsize)
+            self._full = np.memmap(self.rescore_file, dtype=np.float32, mode="r+", shape=(capacity, self.dim))
+
+    def train(self, vectors: np.ndarray):
+        """Fit the per-dimension int8 ranges to `vectors`."""
+        low = vectors.min(axis=0)
+        high = vectors.max(axis=0)
+        self.scale = np.maximum((high - low) / 255.0, 1e-8).astype(np.float32)
+        self.offset = low.astype(np.float32)
+
+    def _widen(self, vectors: np.ndarray):
+        """
+        Refit the int8 ranges if `vectors` fall outside them and
+        requantize the stored rows; otherwise they would clip. The new
+        range gets 5% headroom (within [-1, 1]) so a slowly drifting
+        stream of additions does not refit on every batch.
+        """
+        low = self.offset
+        high = self.offset + 255 * self.scale
+        new_low = np.minimum(low, vectors.min(axis=0))
+        new_high = np.maximum(high, vectors.max(axis=0))
+        if not ((new_low < low).any() or (new_high > high).any()):
+            return
+        existing = np.array(self.float_matrix())
+        headroom = 0.05 * (new_high - new_low)
+        self.train(np.vstack([
+            np.maximum(new_low - headroom, -1.0),
+            np.minimum(new_high + headroom, 1.0)
+        ]))
+        if len(existing):
+            self._matrix[:self._size] = self._encode(existing)
+
+    def _encode(self, vectors: np.ndarray) -> np.ndarray:
+        if self.precision == "float16":
+            return vectors.astype(np.float16)
+        codes = np.rint((vectors - self.offset) / self.scale) - 128
+        return np.clip(codes, -128, 127).astype(np.int8)
+
+    def _decode(self, codes: np.ndarray) -> np.ndarray:
+        if self.precision == "float16":
+            return codes.astype(np.float32)
+        return (codes.astype(np.float32) + 128) * self.scale + self.offset
+
+    def add_batch(self, ids, vectors):
+        ids = np.asarray(ids, dtype=np.int64)
+        if len(ids) == 0:
+            return
+        vectors = self.normalize(vectors)
+        if self.dim is None:
+            self.dim = vectors.shape[1]
+        if vectors.shape[1] != self.dim:
+            raise ValueError(f"Expected vectors of size {self.dim}, got {vectors.shape[1]}")
+        if self.precision == "int8":
+            if self.scale is None:
+                self.train(vectors)
+            else:
+                self._widen(vectors)
+
+        self._reserve(len(ids))
+        end = self._size + len(ids)
+        self._matrix[self._size:end] = self._encode(vectors)
+        self._ids[self._size:end] = ids
+        if self._full is not None:
+            self._full[self._size:end] = vectors
+        self._size = end
+
+    def build(self, ids, vectors):
+        self.scale = None
+        self.offset = None
+        super().build(ids, vectors)
+
+    def remove(self, doc_ids):
+        if self._size == 0:
+            return
+        keep = ~np.isin(self.ids, np.asarray(list(doc_ids), dtype=np.int64))
+        if self._full is not None:
+            kept = int(keep.sum())
+            self._full[:kept] = self._full[:self._size][keep]
+        super().remove(doc_ids)
+
+    def scores(self, query_vector, block: int = 65536) -> np.ndarray:
+        """Approximate cosine similarity computed on the codes, blockwise."""
+        query = self.normalize(query_vector)[0]
+        if self.precision == "int8":
+            # x = code * scale + (128 * scale + offset), so fold scale into the query
+            weights = query * self.scale
+            bias = float(query @ (128 * self.scale + self.offset))
+        else:
+            weights = query
+            bias = 0.0
+        scores = np.empty(self._size, dtype=np.float32)
+        for start in range(0, self._size, block):
+            chunk = self._matrix[start:min(start + block, self._size)]
+            scores[start:start + len(chunk)] = chunk.astype(np.float32) @ weights + bias
+        return scores
+
+    def scores_many(self, query_vectors, block: int = 65536) -> np.ndarray:
+        """(queries, rows) approximate similarities, one GEMM per block of codes."""
+        queries = self.normalize(query_vectors)
+        if self.precision == "int8":
+            weights = queries * self.scale
+            bias = queries @ (128 * self.scale + self.offset)
+        else:
+            weights = queries
+            bias = np.zeros(len(queries), dtype=np.float32)
+        scores = np.empty((len(queries), self._size), dtype=np.float32)
+        for start in range(0, self._size, block):
+            chunk = self._matrix[start:min(start + block, self._size)]
+            scores[:, start:start + len(chunk)] = weights @ chunk.astype(np.float32).T + bias[:, None]
+        return scores
+
+    def search_many(self, query_vectors, top_k: int = 5, threshold: float = None, block: int = 1024,
+                    mask: np.ndarray = None, rescore: bool = True):
+        if not rescore or self._full is None:
+            return super().search_many(query_vectors, top_k, threshold, block, mask)
+
+        queries = np.array(query_vectors, dtype=np.float32, ndmin=2)
+        results = [[] for _ in range(len(queries))]
+        if self._size == 0 or top_k <= 0:
+            return results
+        valid = np.flatnonzero(queries.any(axis=1))
+        for start in range(0, len(valid), block):
+            batch = valid[start:start + block]
+            normalized = self.normalize(queries[batch])
+            approx = self.scores_many(queries[batch])
+            if mask is not None:
+                approx[:, ~mask] = -np.inf
+            candidates = self.top_rows_many(approx, top_k * self.rescore_factor)
+            for i, query, rows, row_scores in zip(batch, normalized, candidates,
+                                                  np.take_along_axis(approx, candidates, axis=1)):
+                # sorted rows read the rescore memmap sequentially
+                rows = np.sort(rows[row_scores > -np.inf])
+                exact = self._full[rows] @ query
+                order = self.top_rows(exact, top_k, threshold)
+                results[i] = [(int(self._ids[rows[j]]), float(exact[j])) for j in order]
+        return results
+
+    def search(self, query_vector, top_k: int = 5, threshold: float = None, mask: np.ndarray = None,
+               rescore: bool = True):
+        if self._size == 0 or top_k <= 0:
+            return []
+        query_vector = np.asarray(query_vector, dtype=np.float32)
+        if not query_vector.any():
+            return []
+
+        approx = self.scores(query_vector)
+        if not rescore or self._full is None:
+            return self.top_k(approx, top_k, threshold, mask)
+
+        rows = self.top_rows(approx, top_k * self.rescore_factor, mask=mask)
+        exact = self._full[rows] @ self.normalize(query_vector)[0]
+        order = self.top_rows(exact, top_k, threshold)
+        return [(int(self._ids[rows[i]]), float(exact[i])) for i in order]
+
+    def vector(self, row: int) -> np.ndarray:
+        """The float32 vector stored at `row` (exact if rescoring is enabled)."""
+        if self._full is not None:
+            return np.array(self._full[row])
+        return self._decode(self._matrix[row])
+
+    def vectors(self, rows) -> np.ndarray:
+        # decodes (or reads from the rescore file) only these rows
+        rows = np.asarray(rows, dtype=np.int64)
+        if self._full is not None:
+            return np.array(self._full[rows], dtype=np.float32)
+        return self._decode(self._matrix[rows])
+
+    def float_matrix(self) -> np.ndarray:
+        if self._full is not None:
+            return self._full[:self._size]
+        return self._decode(self.matrix)
+
+    def memory_bytes(self) -> int:
+        """Bytes of RAM held by the codes and ids (the rescore file is on disk)."""
+        return self.matrix.nbytes + self.ids.nbytes
+
+
+def _remove_file(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+class IndexVectorView(Mapping):
+    """Read-only title -> vector mapping backed by the rows of an index."""
+
+    def __init__(self, index: VectorIndex, rows: dict):
+        self.index = index
+        self.rows = rows
+
+    def __getitem__(self, title):
+        return self.index.vector(self.rows[title])
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def __len__(self):
+        return len(self.rows)
@@ -0,0 +1,118 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+_MISS = object()
+
+
+def normalize_query(query: str) -> str:
+    """Collapse whitespace so trivially different spellings share a cache entry."""
+    return " ".join((query or "").split())
+
+
+def estimate_size(value) -> int:
+    """
+    Approximate bytes held by a cached result.
+
+    Walks lists / tuples / dicts and counts strings and numbers; other
+    objects (Documents) are shared with the corpus and only cost the
+    reference.
+    """
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(estimate_size(key) + estimate_size(item) for key, item in value.items())
+    elif isinstance(value, (list, tuple)):
+        size += sum(estimate_size(item) for item in value)
+    elif not isinstance(value, (str, bytes, int, float, bool, type(None))):
+        return 8
+    return size
+
+
+def _copy(value):
+    # callers get their own lists / dicts at every level (e.g. the nested
+    # "sources" of an answer); Documents stay shared
+    if isinstance(value, list):
+        return [_copy(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _copy(item) for key, item in value.items()}
+    return value
+
+
+class QueryCache:
+    """
+    Bounded LRU cache of query results with a time-to-live.
+
+    Keys are built by the caller and include the corpus version, so a
+    result computed before a mutation is never served after it. Entries
+    are evicted least-recently-used first once `max_entries` or
+    `max_bytes` is exceeded, and expire `ttl` seconds after insertion
+    (ttl=None disables expiry).
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 600.0, max_bytes: int = 32 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expired = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key, _MISS)
+            if entry is not _MISS:
+                value, size, expires = entry
+                if expires is None or time.monotonic() < expires:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return _copy(value)
+                self._drop(key)
+                self.expired += 1
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        size = estimate_size(value) + estimate_size(key)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        expires = None if self.ttl is None else time.monotonic() + self.ttl
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (_copy(value), size, expires)
+            self.memory_bytes += size
+            while self._entries and (
+                len(self._entries) > self.max_entries
+                or (self.max_bytes is not None and self.memory_bytes > self.max_bytes)
+            ):
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _drop(self, key):
+        _, size, _ = self._entries.pop(key)
+        self.memory_bytes -= size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.memory_bytes = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "memory_bytes": self.memory_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expired": self.expired
+        }
@@ -0,0 +1,171 @@
+"""
+Columnar corpus snapshots.
+
+A snapshot is a directory with one .npy file per column plus meta.json:
+
+- numeric columns: doc_id, word_count, difficulty features/score,
+  cluster_id, embedding_row (row in embeddings.npy, -1 if none)
+- categorical columns (int32 codes + category list in meta.json):
+  document_type, ingestion_date, difficulty_label
+- string columns (utf-8 bytes + int64 offsets): title, file_path, content
+
+Every column is loaded with np.load(mmap_mode="r"), so opening a
+snapshot costs only the pages that are actually read.
+"""
+
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+SNAPSHOT_VERSION = 1
+NUMERIC_COLUMNS = ("doc_id", "word_count", "features", "difficulty_score", "cluster_id", "embedding_row")
+CATEGORICAL_COLUMNS = ("document_type", "ingestion_date", "difficulty_label")
+STRING_COLUMNS = ("title", "file_path", "content")
+
+
+def _string_column(values):
+    encoded = [(value or "").encode("utf-8") for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(value) for value in encoded], out=offsets[1:])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+def _categorical_column(values):
+    categories = {}
+    codes = np.empty(len(values), dtype=np.int32)
+    for i, value in enumerate(values):
+        codes[i] = -1 if value is None else categories.setdefault(value, len(categories))
+    return codes, list(categories)
+
+
+def write_snapshot(directory, documents, features, vector_index=None, include_content=True):
+    """
+    Write `documents` (with their (N, 4) difficulty `features`) as a snapshot.
+
+    The snapshot is built in a temporary directory and swapped in, so
+    readers never see a half-written one.
+    """
+    documents = list(documents)
+    tmp_dir = directory.rstrip(os.sep) + ".tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    def save(name, array):
+        np.save(os.path.join(tmp_dir, f"{name}.npy"), array)
+
+    features = np.asarray(features, dtype=np.float32).reshape(len(documents), 4)
+    save("doc_id", np.array([doc.doc_id for doc in documents], dtype=np.int64))
+    save("word_count", features[:, 0].astype(np.int32))
+    save("features", features)
+    save("difficulty_score", np.array([doc.difficulty_score or 0 for doc in documents], dtype=np.float32))
+    save("cluster_id", np.array(
+        [-1 if doc.cluster_id is None else doc.cluster_id for doc in documents], dtype=np.int32
+    ))
+
+    embedding_row = np.full(len(documents), -1, dtype=np.int64)
+    dim = None
+    if vector_index is not None and len(vector_index):
+        rows = {doc_id: row for row, doc_id in enumerate(vector_index.ids.tolist())}
+        for i, doc in enumerate(documents):
+            embedding_row[i] = rows.get(doc.doc_id, -1)
+        embeddings = vector_index.float_matrix()
+        dim = int(embeddings.shape[1])
+        save("embeddings", embeddings)
+    save("embedding_row", embedding_row)
+
+    categories = {}
+    for name in CATEGORICAL_COLUMNS:
+        codes, categories[name] = _categorical_column([getattr(doc, name) for doc in documents])
+        save(name, codes)
+
+    strings = [name for name in STRING_COLUMNS if include_content or name != "content"]
+    for name in strings:
+        data, offsets = _string_column([getattr(doc, name) for doc in documents])
+        save(f"{name}.data", data)
+        save(f"{name}.offsets", offsets)
+
+    with open(os.path.join(tmp_dir, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump({
+            "version": SNAPSHOT_VERSION,
+            "count": len(documents),
+            "embedding_dim": dim,
+            "categories": categories,
+            "strings": strings
+        }, f, ensure_ascii=False)
+
+    old_dir = directory.rstrip(os.sep) + ".old"
+    shutil.rmtree(old_dir, ignore_errors=True)
+    if os.path.exists(directory):
+        os.replace(directory, old_dir)
+    os.replace(tmp_dir, directory)
+    shutil.rmtree(old_dir, ignore_errors=True)
+    return directory
+
+
+class CorpusSnapshot:
+    """Read-only, memory-mapped view of a snapshot written by write_snapshot."""
+
+    def __init__(self, directory, mmap=True):
+        self.directory = directory
+        with open(os.path.join(directory, "meta.json"), "r", encoding="utf-8") as f:
+            self.meta = json.load(f)
+        if self.meta.get("version") != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot version: {self.meta.get('version')}")
+        self._mmap_mode = "r" if mmap else None
+        self._arrays = {}
+
+    def __len__(self):
+        return self.meta["count"]
+
+    def _array(self, name):
+        if name not in self._arrays:
+            self._arrays[name] = np.load(os.path.join(self.directory, f"{name}.npy"), mmap_mode=self._mmap_mode)
+        return self._arrays[name]
+
+    @property
+    def columns(self):
+        return list(NUMERIC_COLUMNS) + list(CATEGORICAL_COLUMNS) + list(self.meta["strings"])
+
+    def column(self, name):
+        """Numeric column, categorical values (object array) or decoded strings."""
+        if name in NUMERIC_COLUMNS:
+            return self._array(name)
+        if name in CATEGORICAL_COLUMNS:
+            categories = np.array(self.meta["categories"][name] + [None], dtype=object)
+            # code -1 maps to the trailing None
+            return categories[self._array(name)]
+        if name in self.meta["strings"]:
+            return [self.string(name, i) for i in range(len(self))]
+        raise KeyError(name)
+
+    def codes(self, name):
+        """Raw int32 codes and categories of a categorical column."""
+        return self._array(name), self.meta["categories"][name]
+
+    def string(self, name, i):
+        offsets = self._array(f"{name}.offsets")
+        data = self._array(f"{name}.data")
+        return bytes(data[offsets[i]:offsets[i + 1]]).decode("utf-8")
+
+    @property
+    def embeddings(self):
+        return self._array("embeddings") if self.meta.get("embedding_dim") else None
+
+    def embedding(self, i):
+        row = int(self._array("embedding_row")[i])
+        return None if row < 0 else self.embeddings[row]
+
+    def to_dataframe(self, columns=None):
+        columns = columns or [c for c in self.columns if c not in ("features", "content")]
+        data = {}
+        for name in columns:
+            if name == "features":
+                features = self._array("features")
+                for j, feature in enumerate(("word_count", "avg_word_length", "unique_ratio", "long_word_ratio")):
+                    data.setdefault(feature, features[:, j])
+            else:
+                data[name] = self.column(name)
+        return pd.DataFrame(data)
@@ -0,0 +1,203 @@
+import sqlite3
+import threading
+
+from src.ssa.core.document import Document
+from src.ssa.core import compression
+
+
+class LazyDocument(Document):
+    """Document whose content is read from the SQLite store on access."""
+
+    __slots__ = ("_store", "row_id")
+
+    def __init__(self, store, row_id, title, file_path, ingestion_date, document_type):
+        self._store = store
+        self.row_id = row_id
+        super().__init__(title, None, file_path, ingestion_date, document_type)
+
+    @property
+    def content(self):
+        # not cached, so iterating a large corpus never pins all content in RAM
+        if self._content is not None:
+            return Document.content.fget(self)
+        return self._store.get_content(self.row_id) or ""
+
+    @content.setter
+    def content(self, value):
+        self._content = value
+        self._token_ids = None
+        self._fingerprint = None
+
+
+class SQLiteDocumentStore:
+    """
+    SQLite-backed document store (WAL mode).
+
+    Documents are keyed by file_path, with secondary indexes on title,
+    document_type and ingestion_date. Bulk inserts run in a single
+    transaction, and metadata can be listed without reading content.
+    Content written as "content_z" (see Document.to_dict) is kept as a
+    compressed BLOB with its codec and decompressed on read.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS documents (
+            id INTEGER PRIMARY KEY,
+            title TEXT,
+            file_path TEXT UNIQUE,
+            ingestion_date TEXT,
+            document_type TEXT,
+            content TEXT,
+            codec TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_documents_title ON documents(title);
+        CREATE INDEX IF NOT EXISTS idx_documents_type ON documents(document_type);
+        CREATE INDEX IF NOT EXISTS idx_documents_date ON documents(ingestion_date);
+    """
+
+    COLUMNS = ("title", "file_path", "ingestion_date", "document_type", "content", "codec")
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(self.SCHEMA)
+        columns = {row["name"] for row in self.conn.execute("PRAGMA table_info(documents)")}
+        if "codec" not in columns:
+            # databases created before compressed content was supported
+            self.conn.execute("ALTER TABLE documents ADD COLUMN codec TEXT")
+        self.conn.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def __contains__(self, file_path):
+        with self._lock:
+            row = self.conn.execute("SELECT 1 FROM documents WHERE file_path = ?", (file_path,)).fetchone()
+        return row is not None
+
+    def _values(self, doc_dict):
+        if "content_z" in doc_dict:
+            content = compression.from_text(doc_dict["content_z"])
+            codec = doc_dict["codec"]
+        else:
+            content = doc_dict.get("content") or doc_dict.get("Content", "")
+            codec = None
+        return (
+            doc_dict.get("title", ""),
+            doc_dict.get("file_path", ""),
+            doc_dict.get("ingestion_date", ""),
+            doc_dict.get("document_type"),
+            content,
+            codec
+        )
+
+    def _to_dict(self, row):
+        doc = {key: row[key] for key in self.COLUMNS if key not in ("content", "codec")}
+        if row["codec"]:
+            doc["content_z"] = compression.to_text(row["content"])
+            doc["codec"] = row["codec"]
+        else:
+            doc["content"] = row["content"]
+        return doc
+
+    def put(self, doc_dict):
+        self.put_many([doc_dict])
+
+    def put_many(self, doc_dicts):
+        """Insert or update documents in one transaction."""
+        sql = f"""
+            INSERT INTO documents ({", ".join(self.COLUMNS)}) VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(file_path) DO UPDATE SET
+                title = excluded.title,
+                ingestion_date = excluded.ingestion_date,
+                document_type = excluded.document_type,
+                content = excluded.content,
+                codec = excluded.codec
+        """
+        with self._lock, self.conn:
+            self.conn.executemany(sql, (self._values(d) for d in doc_dicts))
+
+    def delete(self, file_path):
+        with self._lock, self.conn:
+            cursor = self.conn.execute("DELETE FROM documents WHERE file_path = ?", (file_path,))
+        return cursor.rowcount > 0
+
+    def get(self, file_path):
+        with self._lock:
+            row = self.conn.execute("SELECT * FROM documents WHERE file_path = ?", (file_path,)).fetchone()
+        return None if row is None else self._to_dict(row)
+
+    def get_content(self, doc_id):
+        with self._lock:
+            row = self.conn.execute("SELECT content, codec FROM documents WHERE id = ?", (doc_id,)).fetchone()
+        if row is None:
+            return None
+        return compression.decompress(row[0], row[1]) if row[1] else row[0]
+
+    def iter_documents(self, batch_size=1000):
+        """Yield full document dicts, including content, a batch at a time."""
+        for row in self._iter_rows(f"id, {', '.join(self.COLUMNS)}", batch_size):
+            yield self._to_dict(row)
+
+    def _iter_rows(self, columns, batch_size):
+        last_id = 0
+        while True:
+            with self._lock:
+                rows = self.conn.execute(
+                    f"SELECT {columns} FROM documents WHERE id > ? ORDER BY id LIMIT ?",
+                    (last_id, batch_size)
+                ).fetchall()
+            if not rows:
+                return
+            yield from rows
+            last_id = rows[-1]["id"]
+
+    def _lazy(self, row):
+        return LazyDocument(
+            self, row["id"], row["title"], row["file_path"], row["ingestion_date"], row["document_type"]
+        )
+
+    def documents(self, batch_size=1000):
+        """Yield LazyDocuments; content is fetched only when accessed."""
+        for row in self._iter_rows("id, title, file_path, ingestion_date, document_type", batch_size):
+            yield self._lazy(row)
+
+    def find(self, title=None, file_path=None, document_type=None, date_from=None, date_to=None, limit=None):
+        """Indexed metadata lookup; returns LazyDocuments."""
+        clauses = []
+        params = []
+        for column, value in (("title", title), ("file_path", file_path), ("document_type", document_type)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if date_from is not None:
+            clauses.append("ingestion_date >= ?")
+            params.append(date_from)
+        if date_to is not None:
+            clauses.append("ingestion_date <= ?")
+            params.append(date_to)
+
+        sql = "SELECT id, title, file_path, ingestion_date, document_type FROM documents"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            rows = self.conn.execute(sql, params).fetchall()
+        return [self._lazy(row) for row in rows]
+
+    def compact(self):
+        with self._lock:
+            self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self.conn.execute("VACUUM")
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
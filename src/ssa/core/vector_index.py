@@ -0,0 +1,197 @@
+import numpy as np
+
+
+class VectorIndex:
+    """
+    Exact cosine-similarity index over one contiguous float32 matrix.
+
+    Rows are L2-normalized when they are added, so a query is a single
+    matrix-vector product followed by an argpartition top-k.
+    """
+
+    def __init__(self, dim: int = None, capacity: int = 64):
+        self.dim = dim
+        self._capacity = capacity
+        self._matrix = None
+        self._ids = np.zeros(capacity, dtype=np.int64)
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def matrix(self) -> np.ndarray:
+        if self._matrix is None:
+            return np.zeros((0, self.dim or 0), dtype=np.float32)
+        return self._matrix[:self._size]
+
+    @property
+    def ids(self) -> np.ndarray:
+        return self._ids[:self._size]
+
+    @staticmethod
+    def normalize(vectors) -> np.ndarray:
+        """Return a 2-D float32 copy of `vectors` with unit-length rows."""
+        vectors = np.array(vectors, dtype=np.float32, ndmin=2)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    def _reserve(self, extra: int):
+        needed = self._size + extra
+        if self._matrix is not None and needed <= len(self._matrix):
+            return
+        capacity = max(self._capacity, needed, 2 * self._size)
+        matrix = np.zeros((capacity, self.dim), dtype=np.float32)
+        ids = np.zeros(capacity, dtype=np.int64)
+        if self._matrix is not None:
+            matrix[:self._size] = self._matrix[:self._size]
+            ids[:self._size] = self._ids[:self._size]
+        self._matrix = matrix
+        self._ids = ids
+
+    def build(self, ids, vectors):
+        """Replace the index contents with `vectors` keyed by `ids`."""
+        self._matrix = None
+        self._size = 0
+        self.add_batch(ids, vectors)
+
+    def add(self, doc_id: int, vector):
+        self.add_batch([doc_id], [vector])
+
+    def add_batch(self, ids, vectors):
+        ids = np.asarray(ids, dtype=np.int64)
+        if len(ids) == 0:
+            return
+        vectors = self.normalize(vectors)
+        if self.dim is None:
+            self.dim = vectors.shape[1]
+        if vectors.shape[1] != self.dim:
+            raise ValueError(f"Expected vectors of size {self.dim}, got {vectors.shape[1]}")
+
+        self._reserve(len(ids))
+        self._matrix[self._size:self._size + len(ids)] = vectors
+        self._ids[self._size:self._size + len(ids)] = ids
+        self._size += len(ids)
+
+    def relabel(self, ids):
+        """Replace the id of every row, in row order (e.g. after loading a persisted index)."""
+        ids = np.asarray(ids, dtype=np.int64)
+        if len(ids) != self._size:
+            raise ValueError(f"Expected {self._size} ids, got {len(ids)}")
+        self._ids[:self._size] = ids
+
+    def remove(self, doc_ids):
+        """Drop every row whose id is in `doc_ids`."""
+        if self._size == 0:
+            return
+        keep = ~np.isin(self.ids, np.asarray(list(doc_ids), dtype=np.int64))
+        kept = int(keep.sum())
+        self._matrix[:kept] = self.matrix[keep]
+        self._ids[:kept] = self.ids[keep]
+        self._size = kept
+
+    def vector(self, row: int) -> np.ndarray:
+        """The (normalized) vector stored at `row`."""
+        return self.matrix[row].copy()
+
+    def vectors(self, rows) -> np.ndarray:
+        """The (normalized) vectors stored at `rows`, as one float32 matrix."""
+        return self.matrix[np.asarray(rows, dtype=np.int64)]
+
+    def scores(self, query_vector) -> np.ndarray:
+        """Cosine similarity of `query_vector` against every row."""
+        query = self.normalize(query_vector)[0]
+        return self.matrix @ query
+
+    def search(self, query_vector, top_k: int = 5, threshold: float = None, mask: np.ndarray = None):
+        """
+        Return up to `top_k` (id, similarity) pairs, best first.
+
+        Rows scoring below `threshold`, or False in the optional boolean
+        row `mask`, are dropped before the top-k selection.
+        """
+        if self._size == 0 or top_k <= 0:
+            return []
+        query_vector = np.asarray(query_vector, dtype=np.float32)
+        if not query_vector.any():
+            return []
+        return self.top_k(self.scores(query_vector), top_k, threshold, mask)
+
+    def scores_many(self, query_vectors) -> np.ndarray:
+        """(queries, rows) cosine similarities from one matrix-matrix product."""
+        return self.normalize(query_vectors) @ self.matrix.T
+
+    def search_many(self, query_vectors, top_k: int = 5, threshold: float = None, block: int = 1024,
+                    mask: np.ndarray = None):
+        """
+        search() for many queries at once.
+
+        Queries are scored a block at a time (one GEMM per block, so the
+        score matrix stays at block x rows) and top-k is selected for
+        the whole block with a row-wise argpartition. Returns one result
+        list per query; all-zero queries get []. `mask` applies to
+        every query.
+        """
+        queries = np.array(query_vectors, dtype=np.float32, ndmin=2)
+        results = [[] for _ in range(len(queries))]
+        if self._size == 0 or top_k <= 0:
+            return results
+        valid = np.flatnonzero(queries.any(axis=1))
+        for start in range(0, len(valid), block):
+            batch = valid[start:start + block]
+            scores = self.scores_many(queries[batch])
+            if mask is not None:
+                scores[:, ~mask] = -np.inf
+            rows = self.top_rows_many(scores, top_k)
+            for i, query_rows, query_scores in zip(batch, rows, np.take_along_axis(scores, rows, axis=1)):
+                results[i] = [
+                    (int(self._ids[row]), float(score))
+                    for row, score in zip(query_rows, query_scores)
+                    if score > -np.inf and (threshold is None or score >= threshold)
+                ]
+        return results
+
+    @staticmethod
+    def top_rows_many(scores: np.ndarray, top_k: int) -> np.ndarray:
+        """Row positions of the best `top_k` scores of each query (a row of `scores`), best first."""
+        top_k = min(top_k, scores.shape[1])
+        if top_k < scores.shape[1]:
+            rows = np.argpartition(-scores, top_k - 1, axis=1)[:, :top_k]
+        else:
+            rows = np.broadcast_to(np.arange(scores.shape[1]), scores.shape)
+        order = np.argsort(-np.take_along_axis(scores, rows, axis=1), axis=1, kind="stable")
+        return np.take_along_axis(rows, order, axis=1)
+
+    @staticmethod
+    def top_rows(scores: np.ndarray, top_k: int, threshold: float = None, mask: np.ndarray = None) -> np.ndarray:
+        """Row positions of the best `top_k` scores, best first."""
+        keep = np.ones(len(scores), dtype=bool) if mask is None else mask.copy()
+        if threshold is not None:
+            keep &= scores >= threshold
+        candidates = np.flatnonzero(keep)
+
+        if len(candidates) > top_k:
+            part = np.argpartition(-scores[candidates], top_k - 1)[:top_k]
+            candidates = candidates[part]
+        return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+    def top_k(self, scores: np.ndarray, top_k: int, threshold: float = None, mask: np.ndarray = None):
+        """Select the best `top_k` (id, score) pairs of a precomputed score vector."""
+        rows = self.top_rows(scores, top_k, threshold, mask)
+        return [(int(self._ids[i]), float(scores[i])) for i in rows]
+
+    def float_matrix(self) -> np.ndarray:
+        """The indexed vectors as a float32 matrix."""
+        return self.matrix
+
+    def save(self, path: str):
+        """Write the index to an .npz file."""
+        np.savez(path, matrix=self.matrix, ids=self.ids)
+
+    @classmethod
+    def load(cls, path: str):
+        data = np.load(path)
+        index = cls(dim=data["matrix"].shape[1])
+        index.add_batch(data["ids"], data["matrix"])
+        return index
@@ -0,0 +1,81 @@
+import threading
+
+import numpy as np
+
+
+class Vocabulary:
+    """
+    Corpus-wide token <-> int32 id mapping.
+
+    Documents store their tokens as int32 id arrays against a shared
+    vocabulary, so token statistics become NumPy operations
+    (np.bincount, fancy indexing into token_lengths, ...).
+    """
+
+    def __init__(self):
+        self._ids = {}
+        self._tokens = []
+        self._lengths = np.zeros(1024, dtype=np.int32)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._tokens)
+
+    def __contains__(self, token):
+        return token in self._ids
+
+    def encode(self, tokens) -> np.ndarray:
+        """Map tokens to ids, adding unseen tokens to the vocabulary."""
+        ids = self._ids
+        with self._lock:
+            out = np.empty(len(tokens), dtype=np.int32)
+            for i, token in enumerate(tokens):
+                token_id = ids.get(token)
+                if token_id is None:
+                    token_id = self._add(token)
+                out[i] = token_id
+        return out
+
+    def _add(self, token):
+        token_id = len(self._tokens)
+        if token_id >= len(self._lengths):
+            lengths = np.zeros(2 * len(self._lengths), dtype=np.int32)
+            lengths[:token_id] = self._lengths[:token_id]
+            self._lengths = lengths
+        self._ids[token] = token_id
+        self._tokens.append(token)
+        self._lengths[token_id] = len(token)
+        return token_id
+
+    def lookup(self, token):
+        """Id of `token`, or None if it has never been seen."""
+        return self._ids.get(token)
+
+    def decode(self, ids):
+        tokens = self._tokens
+        return [tokens[i] for i in ids]
+
+    @property
+    def token_lengths(self) -> np.ndarray:
+        """Character length of every token, indexed by id."""
+        return self._lengths[:len(self._tokens)]
+
+    def counts(self, id_arrays) -> np.ndarray:
+        """Corpus frequency of every token id across `id_arrays`."""
+        arrays = [ids for ids in id_arrays if len(ids)]
+        if not arrays:
+            return np.zeros(len(self), dtype=np.int64)
+        return np.bincount(np.concatenate(arrays), minlength=len(self))
+
+    def most_common(self, counts: np.ndarray, n: int = 5):
+        """Top-n (token, count) pairs from a counts vector."""
+        n = min(n, int(np.count_nonzero(counts)))
+        if n <= 0:
+            return []
+        top = np.argpartition(-counts, n - 1)[:n]
+        top = top[np.argsort(-counts[top], kind="stable")]
+        return [(self._tokens[i], int(counts[i])) for i in top]
+
+
+# shared by every Document unless a corpus sets its own
+default_vocabulary = Vocabulary()
@@ -0,0 +1,82 @@
+import json
+import os
+
+
+class WriteAheadLog:
+    """
+    Append-only JSON-lines log of mutations made since the last checkpoint.
+
+    Records are {"op": "put", "doc": {...}} or {"op": "delete", "key": ...}.
+    Each append is flushed (and fsynced by default) before returning, so
+    a mutation is durable once logged. After the main file has been
+    rewritten (checkpointed), reset() empties the log. Opening the log
+    truncates a torn final line left by a crash.
+    """
+
+    def __init__(self, path, fsync=True):
+        self.path = path
+        self.fsync = fsync
+        self._file = None
+        self.count = 0
+        self._recover()
+
+    def _recover(self):
+        """Count the valid records and cut off a torn tail so new appends start on a clean line."""
+        if not os.path.exists(self.path):
+            return
+        good_offset = 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    json.loads(line)
+                except ValueError:
+                    break
+                good_offset += len(line)
+                self.count += 1
+        if good_offset < os.path.getsize(self.path):
+            print(f"Recovered {self.path}: dropped {os.path.getsize(self.path) - good_offset} byte(s) of a torn write.")
+            os.truncate(self.path, good_offset)
+
+    def __len__(self):
+        return self.count
+
+    def append(self, records):
+        if not records:
+            return
+        if self._file is None:
+            self._file = open(self.path, "ab")
+        self._file.write(b"".join(
+            (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8") for record in records
+        ))
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self.count += len(records)
+
+    def records(self):
+        """Yield logged records in order."""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    return
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    return
+                yield record
+
+    def reset(self):
+        """Drop all records; call only after a successful checkpoint."""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self.count = 0
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -2,6 +2,7 @@ from sklearn.pipeline import Pipeline
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.linear_model import LogisticRegression
 from sklearn.model_selection import GridSearchCV
+from src.ssa.ml.features import difficulty_feature_matrix, difficulty_scores
 
 def train_document_classifier(self):
     texts = []
@@ -46,16 +47,17 @@ def train_document_classifier(self):
     print(f"Besr cross-validation accuracy:{grid_search.best_score_:2f}")
 
 def train_difficulty_classifier(self):
-    x = []
+    documents = list(self.documents)
+    x = difficulty_feature_matrix(documents, cache=getattr(self, "_difficulty_features", None))
+    scores, labels = difficulty_scores(x)
     y = []
 
-    for doc in self.documents:
+    for doc, score, label in zip(documents, scores.tolist(), labels):
         if doc.difficulty_label is None:
-            doc.calculate_difficulty()
-
-        x.append(doc.extract_difficulty_features())
+            doc.difficulty_score = score
+            doc.difficulty_label = label
         y.append(doc.difficulty_label)
-            
+
     if len(set(y)) < 2:
         print("X not enough difficulty classes to train.")
         return
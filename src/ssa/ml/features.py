@@ -1,16 +1,102 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from src.ssa.core.parallel_analytics import shard_difficulty_features
+
+# feature columns: word_count, avg_word_length, unique_ratio, long_word_ratio
+DIFFICULTY_WEIGHTS = np.array([0.01, 0.4, 8.0, 15.0])
+DIFFICULTY_THRESHOLDS = np.array([3, 11])
+DIFFICULTY_LABELS = np.array(["easy", "medium", "hard"], dtype=object)
+
+
 def extract_difficulty_features(self):
-        if not self.tokens:
-            self.preprocess_text()
-        word_count = len(self.tokens)
-        if word_count == 0:
-            return[0,0,0,0]
-        avg_word_length = sum(len(w) for w in self.tokens)/word_count
-        unique_ratio = len(set(self.tokens)) / word_count
-        long_word_ratio = len([w for w in self.tokens if len(w) >6]) /word_count
-
-        return [
-            word_count,
-            avg_word_length,
-            unique_ratio,
-            long_word_ratio
-        ]
+        # vectorized over the document's int32 token ids (see Document.token_stats)
+        return list(self.token_stats())
+
+
+def _feature_block(documents):
+    """(N, 4) difficulty features for `documents` from one concatenated id array."""
+    n = len(documents)
+    features = np.zeros((n, 4), dtype=np.float64)
+    if n == 0:
+        return features
+
+    id_arrays = [doc.token_ids for doc in documents]
+    vocabulary = documents[0].vocabulary
+    word_counts = np.array([len(ids) for ids in id_arrays], dtype=np.int64)
+    features[:, 0] = word_counts
+    if word_counts.sum() == 0:
+        return features
+
+    ids = np.concatenate(id_arrays).astype(np.int64)
+    doc_index = np.repeat(np.arange(n), word_counts)
+    lengths = vocabulary.token_lengths[ids]
+    nonempty = word_counts > 0
+
+    total_length = np.bincount(doc_index, weights=lengths, minlength=n)
+    long_words = np.bincount(doc_index, weights=lengths > 6, minlength=n)
+    # distinct (document, token) pairs -> unique tokens per document
+    pairs = np.unique(doc_index * len(vocabulary) + ids)
+    unique_words = np.bincount(pairs // len(vocabulary), minlength=n)
+
+    counts = word_counts[nonempty]
+    features[nonempty, 1] = total_length[nonempty] / counts
+    features[nonempty, 2] = unique_words[nonempty] / counts
+    features[nonempty, 3] = long_words[nonempty] / counts
+    return features
+
+
+def difficulty_feature_matrix(documents, cache=None, n_jobs=1, chunk_size=1000):
+    """
+    Difficulty features for a whole corpus as an (N, 4) array.
+
+    Rows follow `documents`. `cache` (a dict keyed by content hash) skips
+    documents whose content was already scored. With n_jobs > 1 the
+    misses are sent as raw text, in chunks, to a process pool:
+    tokenization is pure Python, so threads would serialize on the GIL
+    (and on the vocabulary lock).
+    """
+    documents = list(documents)
+    features = np.zeros((len(documents), 4), dtype=np.float64)
+    hashes = None
+    missing = range(len(documents))
+    if cache is not None:
+        hashes = [doc.fingerprint for doc in documents]
+        missing = []
+        for i, key in enumerate(hashes):
+            row = cache.get(key)
+            if row is None:
+                missing.append(i)
+            else:
+                features[i] = row
+    if not missing:
+        return features
+
+    chunks = [missing[i:i + chunk_size] for i in range(0, len(missing), chunk_size)]
+    if n_jobs > 1 and len(chunks) > 1:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            results = list(pool.map(
+                shard_difficulty_features,
+                [[documents[i].content or "" for i in chunk] for chunk in chunks]
+            ))
+    else:
+        results = [_feature_block([documents[i] for i in chunk]) for chunk in chunks]
+
+    for chunk, block in zip(chunks, results):
+        features[chunk] = block
+        if cache is not None:
+            for i, row in zip(chunk, block):
+                cache[hashes[i]] = row
+    return features
+
+
+def difficulty_scores(features):
+    """Vectorized Document.calculate_difficulty: (scores, labels) for an (N, 4) matrix."""
+    features = np.asarray(features, dtype=np.float64).reshape(-1, 4)
+    scores = features @ DIFFICULTY_WEIGHTS
+    labels = DIFFICULTY_LABELS[np.searchsorted(DIFFICULTY_THRESHOLDS, scores, side="right")]
+    empty = features[:, 0] == 0
+    scores[empty] = 0
+    labels[empty] = "easy"
+    return scores, labels
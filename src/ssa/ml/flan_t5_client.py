@@ -1,15 +1,16 @@
 # src/ssa/ml/flan_t5_client.py
-from transformers import pipeline
+from src.ssa.ml.model_registry import shared_pipeline
 
 class FlanT5Client:
     def __init__(self, model_size="small"):
         print(f"Loading Flan-T5-{model_size}...")
-        self.generator = pipeline(
+        self.generator = shared_pipeline(
             "text2text-generation",
-            model=f"google/flan-t5-{model_size}",
+            f"google/flan-t5-{model_size}",
             device=-1,
             torch_dtype="auto"
         )
+        self.generator.get()
         print(f"✅ Flan-T5-{model_size} loaded")
     
     def generate(self, prompt, max_length=300, **kwargs):
@@ -20,23 +20,25 @@ class FlanT5Client:
         Args:
             model_size: "small" (80M), "base" (250M), "large" (780M)
         """
-        try:
-            from transformers import pipeline
-        except ImportError:
-            raise ImportError("Please install transformers: pip install transformers")
+        from .model_registry import shared_pipeline
         
         self.model_size = model_size
         model_name = f"google/flan-t5-{model_size}"
         
         print(f"🔄 Loading Flan-T5-{model_size}... (this may take a minute)")
         
-        # Load model - runs on CPU by default
-        self.generator = pipeline(
+        # Load model - runs on CPU by default, shared with other clients
+        self.generator = shared_pipeline(
             "text2text-generation",
-            model=model_name,
+            model_name,
             device=-1,  # -1 means CPU
             torch_dtype="auto"  # Automatically uses available precision
         )
+        try:
+            # the registry imports transformers when it first loads the pipeline
+            self.generator.get()
+        except ImportError:
+            raise ImportError("Please install transformers: pip install transformers")
         
         print(f"✅ Flan-T5-{model_size} loaded successfully!")
         print(f"   Memory usage: ~{self._get_model_size()} MB")
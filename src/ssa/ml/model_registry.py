@@ -0,0 +1,158 @@
+"""
+Process-wide registry of loaded models.
+
+Every component that needs a SentenceTransformer or transformers
+pipeline asks the registry for a handle instead of loading its own
+copy, so each model is loaded once per process. An optional memory
+budget (MB, also read from SSA_MODEL_MEMORY_MB) evicts the least
+recently used models when a new one would exceed it; an evicted model
+is simply reloaded the next time one of its handles is used.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+def _estimate_size_mb(model) -> float:
+    """Parameter memory of a torch model or pipeline, 0 if unknown."""
+    for candidate in (model, getattr(model, "model", None)):
+        parameters = getattr(candidate, "parameters", None)
+        if parameters is None:
+            continue
+        try:
+            return sum(p.numel() * p.element_size() for p in parameters()) / (1024 * 1024)
+        except Exception:
+            continue
+    return 0.0
+
+
+class ModelHandle:
+    """
+    Lazy, shared reference to a registry model.
+
+    Calls and attribute access are forwarded to the loaded model, so a
+    handle can stand in for a pipeline or model object.
+    """
+
+    def __init__(self, registry, key, loader, size_mb=None):
+        self._registry = registry
+        self._key = key
+        self._loader = loader
+        self._size_mb = size_mb
+
+    @property
+    def key(self):
+        return self._key
+
+    def get(self):
+        return self._registry.get(self._key, self._loader, self._size_mb)
+
+    def __call__(self, *args, **kwargs):
+        return self.get()(*args, **kwargs)
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.get(), name)
+
+    def __repr__(self):
+        return f"ModelHandle({self._key!r})"
+
+
+class ModelRegistry:
+    def __init__(self, memory_budget_mb: float = None):
+        if memory_budget_mb is None and os.environ.get("SSA_MODEL_MEMORY_MB"):
+            memory_budget_mb = float(os.environ["SSA_MODEL_MEMORY_MB"])
+        self.memory_budget_mb = memory_budget_mb
+        self._models = OrderedDict()
+        self._lock = threading.RLock()
+        self._load_locks = {}
+        self.loads = 0
+        self.evictions = 0
+
+    def handle(self, key, loader, size_mb: float = None) -> ModelHandle:
+        return ModelHandle(self, key, loader, size_mb)
+
+    def get(self, key, loader, size_mb: float = None):
+        """Return the model for `key`, calling `loader()` only on first use."""
+        with self._lock:
+            entry = self._models.get(key)
+            if entry is not None:
+                self._models.move_to_end(key)
+                entry["last_used"] = time.time()
+                return entry["model"]
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        # load outside the registry lock so other models stay available
+        with load_lock:
+            with self._lock:
+                entry = self._models.get(key)
+                if entry is not None:
+                    return entry["model"]
+            model = loader()
+            size = size_mb if size_mb is not None else _estimate_size_mb(model)
+            with self._lock:
+                self._models[key] = {"model": model, "size_mb": size, "last_used": time.time()}
+                self.loads += 1
+                self._evict(keep=key)
+            return model
+
+    def _evict(self, keep=None):
+        if self.memory_budget_mb is None:
+            return
+        for key in list(self._models):
+            if self.memory_usage_mb() <= self.memory_budget_mb:
+                break
+            if key == keep:
+                continue
+            del self._models[key]
+            self.evictions += 1
+            print(f"Model registry: evicted {key} to stay within {self.memory_budget_mb:.0f} MB")
+
+    def unload(self, key):
+        with self._lock:
+            return self._models.pop(key, None) is not None
+
+    def clear(self):
+        with self._lock:
+            self._models.clear()
+
+    def memory_usage_mb(self) -> float:
+        return sum(entry["size_mb"] for entry in self._models.values())
+
+    def loaded_models(self):
+        return list(self._models)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "models": {key: round(entry["size_mb"], 1) for key, entry in self._models.items()},
+                "memory_mb": round(self.memory_usage_mb(), 1),
+                "memory_budget_mb": self.memory_budget_mb,
+                "loads": self.loads,
+                "evictions": self.evictions
+            }
+
+
+_registry = ModelRegistry()
+
+
+def get_registry() -> ModelRegistry:
+    return _registry
+
+
+def shared_model(key, loader, size_mb: float = None) -> ModelHandle:
+    """Handle to the process-wide model for `key`."""
+    return _registry.handle(key, loader, size_mb)
+
+
+def shared_pipeline(task: str, model: str, **kwargs) -> ModelHandle:
+    """Handle to a shared transformers pipeline."""
+    def load():
+        from transformers import pipeline
+        return pipeline(task, model=model, **kwargs)
+
+    key = ("pipeline", task, model, tuple(sorted((k, str(v)) for k, v in kwargs.items())))
+    return shared_model(key, load)
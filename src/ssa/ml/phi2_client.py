@@ -5,6 +5,33 @@ Phi-2 Client with CPU optimizations
 
 from transformers import AutoModelForCausalLM, AutoTokenizer
 import torch
+from src.ssa.ml.model_registry import shared_model
+
+def _load_tokenizer(model_name):
+    tokenizer = AutoTokenizer.from_pretrained(
+        model_name, 
+        trust_remote_code=True,
+        padding_side="left"  # Important for Phi-2
+    )
+    
+    # Set pad token if missing
+    if tokenizer.pad_token is None:
+        tokenizer.pad_token = tokenizer.eos_token
+    return tokenizer
+
+def _load_model(model_name, use_cpu):
+    # Load model with CPU optimization
+    model = AutoModelForCausalLM.from_pretrained(
+        model_name,
+        torch_dtype=torch.float32 if use_cpu else torch.float16,  # Use float32 for CPU
+        device_map="cpu" if use_cpu else "auto",
+        trust_remote_code=True,
+        low_cpu_mem_usage=True  # Critical for CPU
+    )
+    
+    # Move to eval mode
+    model.eval()
+    return model
 
 class Phi2Client:
     def __init__(self, use_cpu=True):
@@ -12,28 +39,17 @@ class Phi2Client:
         
         self.model_name = "microsoft/phi-2"
         
-        # Load tokenizer
-        self.tokenizer = AutoTokenizer.from_pretrained(
-            self.model_name, 
-            trust_remote_code=True,
-            padding_side="left"  # Important for Phi-2
+        # Tokenizer and model are shared through the process-wide registry
+        self.tokenizer = shared_model(
+            ("tokenizer", self.model_name),
+            lambda: _load_tokenizer(self.model_name)
         )
-        
-        # Set pad token if missing
-        if self.tokenizer.pad_token is None:
-            self.tokenizer.pad_token = self.tokenizer.eos_token
-        
-        # Load model with CPU optimization
-        self.model = AutoModelForCausalLM.from_pretrained(
-            self.model_name,
-            torch_dtype=torch.float32 if use_cpu else torch.float16,  # Use float32 for CPU
-            device_map="cpu" if use_cpu else "auto",
-            trust_remote_code=True,
-            low_cpu_mem_usage=True  # Critical for CPU
+        self.model = shared_model(
+            ("causal-lm", self.model_name, use_cpu),
+            lambda: _load_model(self.model_name, use_cpu)
         )
-        
-        # Move to eval mode
-        self.model.eval()
+        self.tokenizer.get()
+        self.model.get()
         print("✅ Phi-2 loaded (CPU optimized)")
     
     def generate(self, prompt, max_tokens=100):
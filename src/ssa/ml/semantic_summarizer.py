@@ -36,6 +36,15 @@ class SemanticSummarizer:
         sentences = [p.strip() for p in parts if p.strip() and len(p.strip()) > 10]
         
         return sentences
+
+    def _embed(self, sentences: List[str], text: str, focus_query: str = None):
+        """Encode sentences, the full text and the optional query in one batch."""
+        extra = [text] + ([focus_query] if focus_query else [])
+        embeddings = self.embedder.encode_batch(sentences + extra)
+        n = len(sentences)
+        query_embedding = embeddings[n + 1] if focus_query else None
+        return embeddings[:n], embeddings[n], query_embedding
+
     def summarize_document(self, document, focus_query: str = None) -> Dict:
         """
         Summarize a Document object with metadata.
@@ -83,19 +92,15 @@ class SemanticSummarizer:
         if len(sentences) <= self.num_sentences:
             return ' '.join(sentences)
         
-        # Get embeddings
-        sentence_embeddings = self.embedder.embed_batch(sentences)
+        # Get embeddings (sentences, document and query in one batch)
+        sentence_embeddings, doc_embedding, query_embedding = self._embed(sentences, text, focus_query)
         
         # Calculate similarities
         similarities = []
         
         if focus_query:
-            # For query focus, calculate similarity to query
-            query_embedding = self.embedder.encode(focus_query)
-            
-            # Also get document embedding for diversity
-            doc_embedding = self.embedder.encode(text)
-            
+            # For query focus, combine similarity to query with
+            # similarity to the document for diversity
             for i, sent_emb in enumerate(sentence_embeddings):
                 # Combine query similarity with document centrality
                 query_sim = self.embedder.similarity(query_embedding, sent_emb)
@@ -106,8 +111,6 @@ class SemanticSummarizer:
                 similarities.append((combined_score, i, sentences[i]))
         else:
             # General summary: use document centrality
-            doc_embedding = self.embedder.encode(text)
-            
             for i, sent_emb in enumerate(sentence_embeddings):
                 sim = self.embedder.similarity(doc_embedding, sent_emb)
                 similarities.append((sim, i, sentences[i]))
@@ -131,23 +134,18 @@ class SemanticSummarizer:
         sentences = self._split_into_sentences(text)
         
         # Get embeddings
-        sentence_embeddings = self.embedder.embed_batch(sentences)
+        sentence_embeddings, doc_embedding, query_embedding = self._embed(sentences, text, focus_query)
         
         # Calculate scores
         scores = []
         
         if focus_query:
-            query_embedding = self.embedder.encode(focus_query)
-            doc_embedding = self.embedder.encode(text)
-            
             for i, sent_emb in enumerate(sentence_embeddings):
                 query_sim = self.embedder.similarity(query_embedding, sent_emb)
                 doc_sim = self.embedder.similarity(doc_embedding, sent_emb)
                 combined = 0.7 * query_sim + 0.3 * doc_sim
                 scores.append((combined, query_sim, doc_sim, i, sentences[i]))
         else:
-            doc_embedding = self.embedder.encode(text)
-            
             for i, sent_emb in enumerate(sentence_embeddings):
                 sim = self.embedder.similarity(doc_embedding, sent_emb)
                 scores.append((sim, sim, sim, i, sentences[i]))  # Same for all
@@ -7,6 +7,14 @@ def find_similar_documents(self, query_doc_title, top_n=3):
         if query_doc_title not in self.document_vectors:
             print(f"❌ Document '{query_doc_title}' not found")
             return []
+        graph = getattr(self, "knn_graph", None)
+        doc = self.get_document_by_title(query_doc_title) if hasattr(self, "get_document_by_title") else None
+        if graph is not None and doc is not None and doc.doc_id in graph and top_n <= graph.k:
+            # precomputed neighbours: O(top_n) instead of a scan
+            return [
+                (self.get_document(doc_id).title, similarity)
+                for doc_id, similarity in graph.neighbors(doc.doc_id, top_n)
+            ]
         query_vector = self.document_vectors[query_doc_title]
         results = []
         for title, vector in self.document_vectors.items():
@@ -3,14 +3,15 @@
 Simple LLM that always works (DistilGPT2)
 """
 
-from transformers import pipeline
+from src.ssa.ml.model_registry import shared_pipeline
 
 class SimpleLLM:
     """DistilGPT2 - Small, fast, reliable"""
     
     def __init__(self):
         print("🚀 Loading DistilGPT2...")
-        self.generator = pipeline("text-generation", model="distilgpt2")
+        self.generator = shared_pipeline("text-generation", "distilgpt2")
+        self.generator.get()
         print("✅ DistilGPT2 ready!")
     
     def answer_question(self, question, max_length=150):
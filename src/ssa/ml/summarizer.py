@@ -1,7 +1,7 @@
 from typing import Optional, List, Dict, Any
 import warnings
 warnings.filterwarnings("ignore")
-from transformers import pipeline
+from src.ssa.ml.model_registry import shared_pipeline
 import numpy 
 
 class DocumentSummarizer:
@@ -21,9 +21,9 @@ class DocumentSummarizer:
     def pipeline(self):
         if self._pipeline is None:
             print(f"Loading: {self.model_name}")
-            self._pipeline = pipeline(
+            self._pipeline = shared_pipeline(
                 "summarization",
-                model=self.model_name
+                self.model_name
             )
         return self._pipeline
         
@@ -1,5 +1,6 @@
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.cluster import KMeans
+from scipy.sparse import vstack
 
 class  TfidfEngine:
     def __init__(self):
@@ -20,8 +21,40 @@ class  TfidfEngine:
             )
 
             self.tfidf_matrix = self.tfidf_vectorizer.fit_transform(texts)
+            self.row_ids = [getattr(doc, "doc_id", None) for doc in documents]
             print("Documents vetorized using TF-IDF")
             return self.tfidf_matrix
+    def update(self, documents, changed_ids):
+            """
+            Re-align tfidf_matrix with `documents`, transforming only new
+            documents and those in `changed_ids`; other rows are reused.
+            The fitted vocabulary and idf weights stay fixed until the
+            next vectorize().
+            """
+            if self.tfidf_matrix is None or getattr(self, "row_ids", None) is None:
+                return self.vectorize(documents)
+
+            rows = {doc_id: row for row, doc_id in enumerate(self.row_ids)}
+            reused = []
+            fresh = []
+            order = []
+            for doc in documents:
+                row = rows.get(doc.doc_id)
+                if row is None or doc.doc_id in changed_ids:
+                    order.append(("fresh", len(fresh)))
+                    fresh.append(doc)
+                else:
+                    order.append(("reused", len(reused)))
+                    reused.append(row)
+
+            blocks = [self.tfidf_matrix[reused]]
+            if fresh:
+                blocks.append(self.tfidf_vectorizer.transform([doc.content for doc in fresh]))
+            stacked = vstack(blocks).tocsr()
+            self.tfidf_matrix = stacked[[i if kind == "reused" else len(reused) + i for kind, i in order]]
+            self.row_ids = [doc.doc_id for doc in documents]
+            print(f"TF-IDF updated: {len(fresh)} row(s) recomputed")
+            return self.tfidf_matrix
     def  cluster(self,documents, n_clusters=3):
             if self.tfidf_matrix is None:
                 raise RuntimeError("Call vectorize() first")
@@ -37,11 +70,20 @@ class  TfidfEngine:
 
             kmeans = KMeans(n_clusters=n_clusters, random_state=42)
             labels = kmeans.fit_predict(self.tfidf_matrix)
+            # kept so edited documents can be assigned without a refit
+            self.kmeans = kmeans
+            self.cluster_vectorizer = self.tfidf_vectorizer
 
             for doc, label in zip(documents, labels):
                 doc.cluster_id = label
 
             print(f" Document clutered into {n_clusters} topics")
+            return labels
+    def predict_clusters(self, documents):
+            """Nearest fitted cluster of each document, in the TF-IDF space the clusters were fitted in."""
+            if getattr(self, "kmeans", None) is None:
+                raise RuntimeError("Call cluster() first")
+            return self.kmeans.predict(self.cluster_vectorizer.transform([doc.content for doc in documents]))
     def show_clusters(self, documents):
             clusters = {}
 
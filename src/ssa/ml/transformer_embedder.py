@@ -1,18 +1,28 @@
+import time
 import numpy as np
 from sentence_transformers import SentenceTransformer
 from numpy.linalg import norm
+from src.ssa.ml.model_registry import shared_model
 
 class TransformerEmbedder:
     
-    def __init__(self, model_name="all-MiniLM-L6-v2"):
+    def __init__(self, model_name="all-MiniLM-L6-v2", batch_size=32):
         
         self.model_name = model_name
         self.model = None 
         self.vector_size = None
         self.loaded = False
+        self.batch_size = batch_size
+        self.last_batch_stats = None
     def load_model(self):
         try:
-            self.model = SentenceTransformer(self.model_name)
+            # one SentenceTransformer per model name is shared across the process
+            model_name = self.model_name
+            self.model = shared_model(
+                ("sentence-transformer", model_name),
+                lambda: SentenceTransformer(model_name)
+            )
+            self.model.get()
             try:
                 self.vector_size = self.model.get_sentence_embedding_dimension()
             except Exception:
@@ -22,6 +32,7 @@ class TransformerEmbedder:
             return True
         except Exception as e:
             print(f"Failed to load transformer model '{self.model_name}': {e}")
+            self.model = None
             self.loaded = False
             # ensure vector_size is defined to avoid errors elsewhere
             if self.vector_size is None:
@@ -37,13 +48,75 @@ class TransformerEmbedder:
         embedding = self.model.encode(text, convert_to_numpy=True)
         return embedding
     def encode(self, text: str) -> np.ndarray:
+        # the model may not be loaded yet when every document embedding
+        # came from the embedding cache
+        if not self.loaded:
+            if not self.load_model():
+                return np.zeros(self.vector_size)
         if not text or len(text.strip()) < 3:
             return np.zeros(self.vector_size)
     
         return self.model.encode(text,convert_to_numpy=True)
     
+    def _token_lengths(self, texts):
+        tokenizer = getattr(self.model, "tokenizer", None)
+        if tokenizer is not None:
+            try:
+                encoded = tokenizer(
+                    texts,
+                    add_special_tokens=False,
+                    truncation=True,
+                    max_length=getattr(self.model, "max_seq_length", None) or 512
+                )["input_ids"]
+                return np.array([len(ids) for ids in encoded])
+            except Exception:
+                pass
+        return np.array([len(text.split()) for text in texts])
+
+    def encode_batch(self, texts, batch_size=None, verbose=False) -> np.ndarray:
+        """
+        Encode many texts in length-sorted batches.
+
+        Inputs are ordered by token length so each batch pads to a similar
+        size, then the embeddings are put back in the original order.
+        Texts shorter than 3 characters map to zero vectors, as in encode().
+        Throughput of the last call is kept in `last_batch_stats`.
+        """
+        if not self.loaded:
+            self.load_model()
+        batch_size = batch_size or self.batch_size
+        texts = ["" if text is None else str(text) for text in texts]
+        embeddings = np.zeros((len(texts), self.vector_size or 0), dtype=np.float32)
+        valid = [i for i, text in enumerate(texts) if len(text.strip()) >= 3]
+        if not self.loaded or not valid:
+            return embeddings
+
+        start = time.perf_counter()
+        valid_texts = [texts[i] for i in valid]
+        order = np.argsort(self._token_lengths(valid_texts), kind="stable")
+        for b in range(0, len(order), batch_size):
+            batch_idx = order[b:b + batch_size]
+            batch = self.model.encode(
+                [valid_texts[i] for i in batch_idx],
+                batch_size=batch_size,
+                convert_to_numpy=True
+            )
+            embeddings[[valid[i] for i in batch_idx]] = batch
+        elapsed = time.perf_counter() - start
+
+        self.last_batch_stats = {
+            "texts": len(valid),
+            "batch_size": batch_size,
+            "seconds": elapsed,
+            "texts_per_sec": len(valid) / elapsed if elapsed > 0 else float("inf")
+        }
+        if verbose:
+            print(f"Encoded {len(valid)} texts in {elapsed:.2f}s "
+                  f"({self.last_batch_stats['texts_per_sec']:.1f} texts/sec, batch size {batch_size})")
+        return embeddings
+
     def embed_batch(self, texts):
-        return self.model.encode(texts,convert_to_numpy=True)
+        return self.encode_batch(texts)
     def similarity(self, v1, v2) -> float:
         if norm(v1) == 0 or norm(v2) == 0:
             return 0.0
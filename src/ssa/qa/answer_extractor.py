@@ -9,7 +9,7 @@ class AnswerExtractor:
         self.max_sentence_length = max_sentence_length
         self.embedder = embedder
     def embed_sentences(self, sentences):
-        return self.embedder.embed_batch(sentences)
+        return self.embedder.encode_batch(sentences)
 
     def split_into_sentences(self, text: str) -> List[str]:
         sentences = re.split(r'(?<=[.!?])\s+', text)
@@ -54,29 +54,27 @@ class AnswerExtractor:
 
         all_answers = []
 
-        question_embedding = self.embedder.embed_batch([question])[0]
-
-
+        # collect the sentences of every document so the question and all
+        # sentences are encoded in one batched call
+        candidates = []
         for doc, doc_score in documents:
-            sentences = self.split_into_sentences(doc.content)
-            if not sentences:
-                continue
-
-            sentence_embeddings = self.embedder.embed_batch(sentences)
-
-
-
-            for sentence, sent_emb in zip(sentences, sentence_embeddings):
-                sim = self.score_sentence_relevance(
-                    question_embedding,
-                    sent_emb)
-
-                combined = sim * (0.5 + 0.5 * doc_score)
-                
-                if combined >= min_score:
-                    all_answers.append(
-                    (sentence, combined,doc.title)
-                    )
+            for sentence in self.split_into_sentences(doc.content):
+                candidates.append((sentence, doc, doc_score))
+
+        embeddings = self.embed_sentences([question] + [c[0] for c in candidates])
+        question_embedding = embeddings[0]
+
+        for (sentence, doc, doc_score), sent_emb in zip(candidates, embeddings[1:]):
+            sim = self.score_sentence_relevance(
+                question_embedding,
+                sent_emb)
+
+            combined = sim * (0.5 + 0.5 * doc_score)
+            
+            if combined >= min_score:
+                all_answers.append(
+                (sentence, combined,doc.title)
+                )
         # sort and return top answers after processing all documents
         all_answers.sort(key=lambda x: x[1], reverse=True)
         return all_answers[:max_answers]
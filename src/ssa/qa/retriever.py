@@ -15,21 +15,21 @@ class QARetriever:
         if hasattr(self.manager, "document_vectors") and self.manager.document_vectors:
             self.document_vectors = self.manager.document_vectors
         else:
-            self.manager.init_embedder()
+            if not hasattr(self.manager, "embedder"):
+                self.manager.init_embedder()
             self.manager.compute_all_embeddings()
             self.document_vectors = self.manager.document_vectors
+        self.embedder = self.manager.embedder
 
-    def retrieve_for_question(self, question: str, top_k: int = 3) -> List[Tuple]:
+    def retrieve_for_question(self, question: str, top_k: int = 3, mode: str = "exact") -> List[Tuple]:
         self._ensure_embeddings()
         q_vec = self.embedder.document_to_vector(question)
 
-        results = []
-        for title, vec in self.document_vectors.items():
-            score = self._cosine(q_vec, vec)
-            results.append((title, score))
-
-        results.sort(key=lambda x: x[1], reverse=True)
-        return results[:top_k]
+        index = self.manager.get_search_index(mode)
+        return [
+            (self.manager.get_document(doc_id).title, score)
+            for doc_id, score in index.search(q_vec, top_k)
+        ]
 
     def _cosine(self, a: np.ndarray, b: np.ndarray) -> float:
         if np.linalg.norm(a) == 0 or np.linalg.norm(b) == 0:
@@ -37,10 +37,7 @@ class QARetriever:
         return np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b))
 
     def get_document_by_title(self, title: str):
-        for doc in self.manager.documents:
-            if doc.title == title:
-                return doc
-        return None
+        return self.manager.get_document_by_title(title)
 
     def get_retrieved_documents(self, results):
         docs = []